@@ -0,0 +1,102 @@
+import asyncio
+from concurrent.futures import TimeoutError
+from itertools import islice
+from threading import Event, Thread
+from typing import Any, AsyncIterator, Dict, Iterable
+
+# Marks the end of the datasets in the queue
+_DONE = object()
+
+# Seconds between the producer checks for the consumer to stop
+_POLL_INTERVAL = 0.1
+
+
+def _produce(
+        datasets: Iterable[Dict[str, Any]],
+        queue: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        batch_size: int,
+        stop: Event,
+):
+    """
+    Puts batches of datasets into the queue, waiting while it is full.
+
+    :param datasets: Iterable of dictionaries.
+    :param queue: Bounded queue of the event loop.
+    :param loop: Event loop that owns the queue.
+    :param batch_size: Number of dictionaries in a batch.
+    :param stop: Event that is set when the consumer no longer needs datasets.
+    """
+
+    def put(item) -> bool:
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=_POLL_INTERVAL)
+                return True
+            except TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+
+    iterator = iter(datasets)
+
+    try:
+        while not stop.is_set():
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            if not put(batch):
+                return
+    except Exception as exception:
+        put(exception)
+        return
+
+    put(_DONE)
+
+
+async def aiterate(
+        datasets: Iterable[Dict[str, Any]],
+        batch_size: int = 1000,
+        queue_size: int = 4,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Iterates over datasets in a worker thread without blocking the event loop.
+
+    The thread sends batches of datasets through a bounded queue: when the consumer
+    falls behind, the thread waits until there is room in the queue.
+
+    :param datasets: Iterable of dictionaries, consumed in the worker thread.
+    :param batch_size: Number of dictionaries sent to the event loop at a time.
+    :param queue_size: Maximum number of batches waiting for the consumer.
+    :return: Asynchronous dictionary generator.
+    """
+
+    if batch_size < 1 or queue_size < 1:
+        raise ValueError("The batch size and the queue size must be positive")
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    stop = Event()
+    producer = Thread(
+        target=_produce,
+        args=(datasets, queue, loop, batch_size, stop),
+        daemon=True,
+    )
+    producer.start()
+
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is _DONE:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+
+            for dataset in batch:
+                yield dataset
+    finally:
+        stop.set()
+        while not queue.empty():
+            queue.get_nowait()
+        await loop.run_in_executor(None, producer.join)
@@ -0,0 +1,54 @@
+"""
+Compares the generic dataset builder with the builders compiled by SGen.compile().
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compile
+"""
+
+from itertools import islice
+from time import perf_counter
+
+from fields import Integer
+from validate import OneOf
+from sgen import SGen
+
+FIELD_COUNTS = [5, 10, 18, 50, 200]
+DATASETS = 200000
+
+
+def schema(field_count: int) -> type:
+    """Builds a schema where every third field can be missing"""
+
+    return type(f'Schema{field_count}', (SGen,), {
+        f'field_{index:03}': Integer(
+            validate=OneOf(choices=[1, 2, 3]),
+            allow_none=False,
+            required=bool(index % 3),
+        )
+        for index in range(field_count)
+    })
+
+
+def measure(instance: SGen) -> float:
+    """Returns the number of datasets generated per second"""
+
+    started = perf_counter()
+    produced = sum(1 for _ in islice(instance.positive(), DATASETS))
+
+    return produced / (perf_counter() - started)
+
+
+def main():
+    print(f"{'fields':>8} {'generic/s':>12} {'compiled/s':>12} {'speedup':>8}")
+
+    for field_count in FIELD_COUNTS:
+        schema_class = schema(field_count)
+        generic = measure(schema_class())
+        compiled = measure(schema_class().compile())
+
+        print(f"{field_count:>8} {generic:>12.0f} {compiled:>12.0f} {compiled / generic:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Measures the throughput of SGen.positive() on schemas of growing width.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_generate
+
+The odometer engine builds every dataset in a single pass over the fields,
+so the number of field values produced per second should stay flat while
+the number of fields grows.
+"""
+
+from itertools import islice
+from time import perf_counter
+
+from fields import Integer
+from validate import OneOf
+from sgen import SGen
+
+FIELD_COUNTS = [10, 50, 100, 500, 1000, 2000]
+DATASETS = 20000
+
+
+def wide_schema(field_count: int) -> SGen:
+    """Builds a schema with field_count integer fields"""
+
+    attributes = {
+        f'field_{index:05}': Integer(validate=OneOf(choices=[1, 2, 3]), allow_none=False, required=True)
+        for index in range(field_count)
+    }
+
+    return type(f'Wide{field_count}', (SGen,), attributes)()
+
+
+def main():
+    print(f"{'fields':>8} {'datasets/s':>14} {'values/s':>14}")
+
+    for field_count in FIELD_COUNTS:
+        schema = wide_schema(field_count)
+
+        started = perf_counter()
+        produced = sum(1 for _ in islice(schema.positive(), DATASETS))
+        elapsed = perf_counter() - started
+
+        print(f"{field_count:>8} {produced / elapsed:>14.0f} {produced * field_count / elapsed:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares random strings built one character at a time with the bulk RandomStream.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_primitives
+"""
+
+from random import choice
+from string import ascii_letters
+from time import perf_counter
+
+from primitives import RandomStream
+
+LENGTHS = [8, 64, 1000, 1000000]
+LETTERS = 4000000
+
+
+def per_character(length: int) -> str:
+    return ''.join(choice(ascii_letters) for _ in range(length))
+
+
+def measure(generate, length: int) -> float:
+    """Returns the number of letters generated per second"""
+
+    count = max(1, LETTERS // length)
+    started = perf_counter()
+    for _ in range(count):
+        generate(length)
+
+    return count * length / (perf_counter() - started)
+
+
+def main():
+    stream = RandomStream()
+
+    print(f"{'length':>8} {'choice/s':>12} {'stream/s':>12} {'speedup':>8}")
+
+    for length in LENGTHS:
+        slow = measure(per_character, length)
+        fast = measure(stream.letters, length)
+
+        print(f"{length:>8} {slow:>12.0f} {fast:>12.0f} {fast / slow:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
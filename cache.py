@@ -0,0 +1,203 @@
+from collections import OrderedDict
+from copy import deepcopy
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from base import FieldABC, ValidatorABC
+from utils import ValuesStorage
+from primitives import current_stream
+
+# Attributes that hold the results of generation rather than the configuration of a field
+_STATE = frozenset(('_local', 'cache'))
+
+
+class ValueCache:
+    """
+    Least recently used cache of field values
+
+    Keys are pairs of a field configuration and a variant, such as the seed and path of the field,
+    so all variants of a configuration can be removed together.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        Initializes the cache
+
+        :param maxsize: Maximum number of value sets, 0 disables the cache.
+        """
+
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._variants: Dict[Hashable, Set[Hashable]] = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+
+            return values
+
+    def put(self, key: Tuple[Hashable, Hashable], values: tuple):
+        with self._lock:
+            self._entries[key] = values
+            self._entries.move_to_end(key)
+            self._variants.setdefault(key[0], set()).add(key)
+            self._evict(self.maxsize)
+
+    def pop(self, config: Hashable):
+        """Removes every variant of a field configuration"""
+
+        with self._lock:
+            for key in self._variants.pop(config, ()):
+                del self._entries[key]
+
+    def _evict(self, maxsize: int):
+        while len(self._entries) > maxsize:
+            key, _ = self._entries.popitem(last=False)
+            variants = self._variants[key[0]]
+            variants.discard(key)
+            if not variants:
+                del self._variants[key[0]]
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict(maxsize)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._variants.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_cache = ValueCache()
+
+
+def set_cache_size(maxsize: int):
+    """
+    Enables the cache of field values or changes its size.
+
+    :param maxsize: Maximum number of cached value sets, 0 disables the cache.
+    """
+
+    if maxsize < 0:
+        raise ValueError("The cache size cannot be negative")
+
+    _cache.resize(maxsize)
+
+
+def clear_cache():
+    """Removes all cached field values"""
+
+    _cache.clear()
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Converts a part of a field configuration into a hashable key.
+
+    Values are keyed together with their type, so 1, True and 1.0 give different keys.
+    Functions and other callables are keyed by identity.
+
+    :param value: Attribute value.
+    :return: Hashable key.
+    :raises TypeError: If the value cannot be converted.
+    """
+
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return dict, tuple((_freeze(key), _freeze(item)) for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(_freeze(item) for item in value)
+    if isinstance(value, (FieldABC, ValidatorABC)):
+        return type(value), _freeze_vars(value)
+    if callable(value):
+        return value
+
+    hash(value)
+    return type(value), value
+
+
+def _freeze_vars(obj: Any) -> Tuple:
+    return tuple(sorted(
+        (name, _freeze(value))
+        for name, value in vars(obj).items()
+        if name not in _STATE
+    ))
+
+
+def fingerprint(field: FieldABC, is_positive: bool) -> Optional[Hashable]:
+    """
+    Returns the configuration key of field values: the field class, its validators and flags.
+
+    :param field: Field.
+    :param is_positive: True for positive values.
+    :return: Hashable key or None if the configuration cannot be hashed.
+    """
+
+    try:
+        return type(field), is_positive, _freeze_vars(field)
+    except TypeError:
+        return None
+
+
+def invalidate(field: FieldABC):
+    """
+    Removes the cached values of a field configuration for every seed and path.
+
+    :param field: Field.
+    """
+
+    for is_positive in (True, False):
+        config = fingerprint(field, is_positive)
+        if config is not None:
+            _cache.pop(config)
+
+
+def cached_values(method: Callable, is_positive: bool) -> Callable:
+    """
+    Wraps the positive or negative method of a field class with the cache.
+
+    Only the outermost call is cached, calls made through super() by subclasses are not.
+    Fields with data_from and fields created with cache=False are always generated.
+    Cached values are stored and returned as deep copies.
+
+    :param method: Method that returns the values of a field.
+    :param is_positive: True for the positive method.
+    :return: Method.
+    """
+
+    @wraps(method)
+    def wrapper(field):
+        if (
+                not _cache.maxsize
+                or not field.cache
+                or getattr(type(field), method.__name__) is not wrapper
+                or (field.positive_data_from if is_positive else field.negative_data_from) is not None
+        ):
+            return method(field)
+
+        config = fingerprint(field, is_positive)
+        if config is None:
+            return method(field)
+
+        # Seeded fields draw different values for every seed and path
+        key = config, current_stream().key
+        # Values such as the lists of collections are copied, so callers cannot change the cached ones
+        values = _cache.get(key)
+        if values is None:
+            result = method(field)
+            _cache.put(key, deepcopy(tuple(result)))
+            return result
+
+        field.values = ValuesStorage(deepcopy(values))
+        return field.values
+
+    return wrapper
@@ -0,0 +1,167 @@
+from itertools import cycle, islice, repeat
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from space import DatasetSpace, Product
+from utils import MISSING
+
+
+class ColumnBatch:
+    """Column-oriented batch of datasets"""
+
+    def __init__(self, names: Tuple[str, ...]):
+        """
+        Initializes an empty batch
+
+        :param names: Field names in the order of columns.
+        """
+
+        self.names = names
+        self.columns: Dict[str, List[Any]] = {name: [] for name in names}
+        self.present: Dict[str, List[bool]] = {name: [] for name in names}
+
+    def __len__(self) -> int:
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def __repr__(self):
+        return f"<ColumnBatch: {len(self)} datasets, {len(self.names)} columns>"
+
+    def to_numpy(self, structured: bool = False):
+        """
+        Converts the batch into NumPy masked arrays, missing values are masked.
+
+        :param structured: True if you need a single masked array with a structured dtype.
+        :return: Dictionary of masked arrays or a structured masked array.
+        """
+
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("NumPy is required to convert column batches into arrays") from None
+
+        arrays = {}
+        for name in self.names:
+            values, present = self.columns[name], numpy.array(self.present[name], dtype=bool)
+
+            sample = [value for value, is_present in zip(values, present) if is_present]
+            # Only values of one exact type get a typed array: NumPy would convert [0, 'a'] into strings
+            # and [True, 5] into integers. Lists and dictionaries are stored as objects.
+            types = {type(value) for value in sample}
+            if len(types) == 1 and not issubclass(types.pop(), (list, tuple, dict, set)):
+                try:
+                    sample = numpy.array(sample)
+                except ValueError:
+                    pass
+
+            if isinstance(sample, numpy.ndarray) and sample.ndim == 1 and sample.dtype != object:
+                data = numpy.zeros(len(values), dtype=sample.dtype)
+                data[present] = sample
+            else:
+                data = numpy.empty(len(values), dtype=object)
+                data[:] = values
+
+            arrays[name] = numpy.ma.masked_array(data, mask=~present)
+
+        if not structured:
+            return arrays
+
+        dtype = [(name, arrays[name].dtype) for name in self.names]
+        data = numpy.zeros(len(self), dtype=dtype)
+        mask = numpy.zeros(len(self), dtype=[(name, bool) for name in self.names])
+        for name in self.names:
+            data[name] = arrays[name].data
+            mask[name] = arrays[name].mask
+
+        return numpy.ma.masked_array(data, mask=mask)
+
+
+def column_values(table: Sequence, stride: int, radix: int, start: int, stop: int) -> Iterator[Any]:
+    """
+    Returns the values of a field for the datasets numbered from start to stop.
+
+    A field value is repeated stride times in a row, so the column is built
+    from runs instead of decoding every dataset number.
+
+    :param table: Field values.
+    :param stride: Number of datasets between changes of the field value.
+    :param radix: Number of field values.
+    :param start: Number of the first dataset.
+    :param stop: Number of the dataset after the last one.
+    :return: Iterator of values.
+    """
+
+    if start >= stop:
+        return iter(())
+
+    if stride == 1:
+        offset = start % radix
+        return islice(cycle(table), offset, offset + stop - start)
+
+    runs = []
+    index = start
+    while index < stop:
+        run = min(stride - index % stride, stop - index)
+        runs.append(repeat(table[index // stride % radix], run))
+        index += run
+
+    return (value for run in runs for value in run)
+
+
+def _layout(product: Product) -> List[Tuple[str, Sequence, Sequence, int, int]]:
+    """
+    Prepares the columns of a product: Missing is replaced by None in values
+    and marked in the presence table.
+
+    :param product: Product.
+    :return: List of field names, values, presence, strides and radices.
+    """
+
+    layout = []
+    for name, table, optional, stride, radix in zip(
+            product.names, product.tables, product.optional, product.strides, product.radices
+    ):
+        if not optional:
+            present = None
+        else:
+            present = tuple(value is not MISSING for value in table)
+            table = tuple(None if value is MISSING else value for value in table)
+
+        layout.append((name, table, present, stride, radix))
+
+    return layout
+
+
+def column_batches(space: DatasetSpace, names: Tuple[str, ...], batch_size: int) -> Iterator[ColumnBatch]:
+    """
+    Generates the datasets of a space as column-oriented batches.
+
+    :param space: Dataset space with a contiguous range of datasets.
+    :param names: Field names in the order of columns.
+    :param batch_size: Maximum number of datasets in a batch.
+    :return: ColumnBatch generator.
+    """
+
+    if batch_size < 1:
+        raise ValueError("The batch size must be positive")
+    if space.indices.step != 1:
+        raise ValueError("Column batches require a contiguous range of datasets")
+
+    layouts = [_layout(product) for product in space.products]
+
+    for batch_start in range(space.indices.start, space.indices.stop, batch_size):
+        batch_stop = min(batch_start + batch_size, space.indices.stop)
+        batch = ColumnBatch(names)
+
+        for product, product_start, layout in zip(space.products, space.starts, layouts):
+            start = max(batch_start, product_start) - product_start
+            stop = min(batch_stop, product_start + product.size) - product_start
+            if start >= stop:
+                continue
+
+            for name, table, present, stride, radix in layout:
+                batch.columns[name].extend(column_values(table, stride, radix, start, stop))
+                if present is None:
+                    batch.present[name].extend(repeat(True, stop - start))
+                else:
+                    batch.present[name].extend(column_values(present, stride, radix, start, stop))
+
+        yield batch
@@ -0,0 +1,60 @@
+from itertools import product
+from typing import Callable, Iterator, Tuple, Dict, Any
+
+from utils import MISSING
+
+# CPython allows 20 statically nested blocks, deeper schemas are unrolled into itertools.product
+MAX_NESTED_LOOPS = 18
+
+
+def compile_builder(
+        names: Tuple[str, ...],
+        optional: Tuple[bool, ...],
+) -> Callable[..., Iterator[Dict[str, Any]]]:
+    """
+    Generates a function that enumerates the Cartesian product of field values.
+
+    The function takes one sequence of values per field and has a loop per field.
+    The check for Missing is only emitted for optional fields.
+
+    :param names: Field names, the last field changes fastest.
+    :param optional: True for each field whose values contain Missing.
+    :return: Dictionary generator function.
+    """
+
+    tables = ', '.join(f't{position}' for position in range(len(names)))
+    lines = [f'def build({tables}):']
+
+    if len(names) <= MAX_NESTED_LOOPS:
+        for position in range(len(names)):
+            lines.append('    ' * (position + 1) + f'for v{position} in t{position}:')
+        indent = '    ' * (len(names) + 1)
+    else:
+        values = ', '.join(f'v{position}' for position in range(len(names)))
+        lines.append(f'    for {values} in product({tables}):')
+        indent = '    ' * 2
+
+    leading = 0
+    while leading < len(names) and not optional[leading]:
+        leading += 1
+
+    display = ', '.join(f'{names[position]!r}: v{position}' for position in range(leading))
+
+    if leading == len(names):
+        lines.append(f'{indent}yield {{{display}}}')
+    else:
+        lines.append(f'{indent}dataset = {{{display}}}')
+        for position in range(leading, len(names)):
+            assignment = f'dataset[{names[position]!r}] = v{position}'
+            if optional[position]:
+                lines.append(f'{indent}if v{position} is not MISSING:')
+                lines.append(f'{indent}    {assignment}')
+            else:
+                lines.append(f'{indent}{assignment}')
+        lines.append(f'{indent}yield dataset')
+
+    namespace = {'MISSING': MISSING, 'product': product}
+    exec(compile('\n'.join(lines), f'<sgen builder: {", ".join(names)}>', 'exec'), namespace)
+
+    return namespace['build']
+
@@ -0,0 +1,106 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from columns import column_values
+from space import DatasetSpace, Product
+
+# Array type codes from the smallest item size
+_TYPECODES = ('B', 'H', 'I', 'L', 'Q')
+
+
+def typecode_for(radix: int) -> str:
+    """
+    Returns the smallest array type code that can hold the positions of radix values.
+
+    :param radix: Number of field values.
+    :return: Array type code.
+    """
+
+    for typecode in _TYPECODES:
+        if radix <= 2 ** (8 * array(typecode).itemsize):
+            return typecode
+
+    raise OverflowError(f"Too many field values to encode: {radix}")
+
+
+class EncodedProduct(Product):
+    """Datasets stored as a column of value positions per field"""
+
+    def __init__(self, columns: List[Tuple[str, Sequence]], codes: List[array]):
+        """
+        Initializes the encoded datasets
+
+        :param columns: List of field names and their values.
+        :param codes: Column of value positions for each field, one position per dataset.
+        """
+
+        super().__init__(columns)
+        self.codes = codes
+        self.size = len(codes[0]) if codes else 0
+
+    @classmethod
+    def from_product(cls, product: Product) -> 'EncodedProduct':
+        """
+        Encodes all datasets of a product.
+
+        :param product: Product.
+        :return: EncodedProduct.
+        """
+
+        codes = [
+            array(typecode_for(radix), column_values(range(radix), stride, radix, 0, product.size))
+            for stride, radix in zip(product.strides, product.radices)
+        ]
+
+        return cls(list(zip(product.names, product.tables)), codes)
+
+    @classmethod
+    def from_rows(cls, product: Product, rows: List[List[int]]) -> 'EncodedProduct':
+        """
+        Encodes the datasets of a product selected by value positions.
+
+        :param product: Product.
+        :param rows: List of value positions, one per field.
+        :return: EncodedProduct.
+        """
+
+        codes = [
+            array(typecode_for(radix), (row[position] for row in rows))
+            for position, radix in enumerate(product.radices)
+        ]
+
+        return cls(list(zip(product.names, product.tables)), codes)
+
+    def indexes(self, index: int) -> List[int]:
+        return [column[index] for column in self.codes]
+
+    def index_of(self, index: int, position: int) -> int:
+        return self.codes[position][index]
+
+    def datasets(self, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+        for indexes in zip(*(column[start:stop] for column in self.codes)):
+            yield self.dataset(indexes)
+
+    def rows(self, start: int, stop: int, positions: List[int]) -> Iterator[tuple]:
+        for indexes in zip(*(column[start:stop] for column in self.codes)):
+            yield self.values(indexes, positions)
+
+    def fill(self, batch: List[Dict[str, Any]], start: int, stop: int):
+        batch.extend(self.datasets(start, stop))
+
+
+class Corpus(DatasetSpace):
+    """Materialized datasets decoded into dictionaries only when accessed"""
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes taken by the value positions of all datasets"""
+
+        return sum(
+            column.itemsize * len(column)
+            for product in self.products
+            for column in product.codes
+        )
+
+    def __repr__(self):
+        return f"<Corpus: {self.size} datasets, {self.nbytes} bytes of codes>"
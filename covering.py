@@ -0,0 +1,108 @@
+from itertools import combinations, product
+from typing import List, Optional
+
+
+def covering_array(radices: List[int], strength: int = 2) -> List[List[int]]:
+    """
+    Builds a covering array by the IPOG strategy.
+
+    Every combination of values of any strength parameters appears in at least one row.
+    Parameters are added one at a time: existing rows are extended with the value that
+    covers the most missing combinations (horizontal growth), then new rows are added
+    for the combinations that are still missing (vertical growth).
+
+    :param radices: Number of values of each parameter.
+    :param strength: Number of parameters whose value combinations must be covered.
+    :return: List of rows, each row holds one value position per parameter.
+    """
+
+    if strength < 1:
+        raise ValueError("The strength of a covering array must be positive")
+
+    if not radices or not all(radices):
+        return []
+
+    # Parameters with more values first: the initial product then absorbs the largest factors
+    order = sorted(range(len(radices)), key=lambda parameter: -radices[parameter])
+    sorted_radices = [radices[parameter] for parameter in order]
+
+    if len(sorted_radices) <= strength:
+        rows = [list(row) for row in product(*(range(radix) for radix in sorted_radices))]
+    else:
+        rows = _ipog(sorted_radices, strength)
+
+    result = []
+    for row in rows:
+        restored = [0] * len(radices)
+        for position, parameter in enumerate(order):
+            restored[parameter] = row[position] if row[position] is not None else 0
+        result.append(restored)
+
+    return result
+
+
+def _ipog(radices: List[int], strength: int) -> List[List[Optional[int]]]:
+    """
+    Extends the product of the first strength parameters with the rest of the parameters.
+
+    :param radices: Number of values of each parameter.
+    :param strength: Number of parameters whose value combinations must be covered.
+    :return: List of rows, None marks a value that is not needed for coverage.
+    """
+
+    rows = [
+        list(row) + [None] * (len(radices) - strength)
+        for row in product(*(range(radix) for radix in radices[:strength]))
+    ]
+
+    for parameter in range(strength, len(radices)):
+        values = range(radices[parameter])
+
+        # Missing values of the new parameter for each combination of values of the previous ones
+        uncovered = {
+            others: {
+                prefix: set(values)
+                for prefix in product(*(range(radices[other]) for other in others))
+            }
+            for others in combinations(range(parameter), strength - 1)
+        }
+
+        # Horizontal growth
+        for row in rows:
+            gains = [0] * radices[parameter]
+            for others, missing in uncovered.items():
+                for value in missing.get(tuple(row[other] for other in others), ()):
+                    gains[value] += 1
+
+            row[parameter] = best = gains.index(max(gains))
+
+            for others in list(uncovered):
+                missing = uncovered[others]
+                prefix = tuple(row[other] for other in others)
+                if best in missing.get(prefix, ()):
+                    missing[prefix].discard(best)
+                    if not missing[prefix]:
+                        del missing[prefix]
+                        if not missing:
+                            del uncovered[others]
+
+        # Vertical growth
+        for others, missing in uncovered.items():
+            positions = others + (parameter,)
+            for prefix in sorted(missing):
+                for value in sorted(missing[prefix]):
+                    key = prefix + (value,)
+                    for row in rows:
+                        if all(
+                            row[position] is None or row[position] == required
+                            for position, required in zip(positions, key)
+                        ):
+                            break
+                    else:
+                        row = [None] * len(radices)
+                        rows.append(row)
+
+                    for position, required in zip(positions, key):
+                        row[position] = required
+
+    return rows
@@ -0,0 +1,140 @@
+import pickle
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+from utils import MISSING
+
+# First record of every stream
+FORMAT = 'sgen-delta'
+VERSION = 1
+
+# Marks a field that is absent from the previous dataset
+_ABSENT = object()
+
+
+def _same(old: Any, new: Any) -> bool:
+    """
+    Checks that a value has not changed, telling apart equal values of different types such as 1 and True.
+
+    :param old: Previous value.
+    :param new: Current value.
+    :return: True if the value does not need to be written.
+    """
+
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+    if isinstance(new, dict):
+        return old.keys() == new.keys() and all(_same(old[key], new[key]) for key in new)
+    if isinstance(new, (list, tuple)):
+        return len(old) == len(new) and all(_same(a, b) for a, b in zip(old, new))
+
+    return old == new
+
+
+class DeltaWriter:
+    """Writes datasets as the fields changed since the previous dataset"""
+
+    def __init__(self, fp: BinaryIO, protocol: int = pickle.HIGHEST_PROTOCOL):
+        """
+        Initializes the writer and writes the stream header
+
+        :param fp: Binary file object.
+        :param protocol: Pickle protocol of the records.
+        """
+
+        self._fp = fp
+        self._protocol = protocol
+        self._ids: Dict[str, int] = {}
+        self._previous: Dict[str, Any] = {}
+        self.count = 0
+
+        pickle.dump((FORMAT, VERSION), fp, protocol)
+
+    def _id(self, name: str, names: list) -> int:
+        key = self._ids.get(name)
+        if key is None:
+            key = self._ids[name] = len(self._ids)
+            names.append(name)
+
+        return key
+
+    def write(self, dataset: Dict[str, Any], delta: Optional[Tuple[str, Any, Any]] = None):
+        """
+        Writes a dataset.
+
+        :param dataset: Dataset.
+        :param delta: (field, old value, new value) change from the previous dataset if it is known,
+            as generated in the gray order. Without it the datasets are compared field by field.
+        """
+
+        names = []
+        changes = []
+        removed = []
+
+        if delta is not None and self.count:
+            name, _, new = delta
+            if new is MISSING:
+                removed.append(self._id(name, names))
+            else:
+                changes.append((self._id(name, names), new))
+        else:
+            previous = self._previous
+            for name, value in dataset.items():
+                if not _same(previous.get(name, _ABSENT), value):
+                    changes.append((self._id(name, names), value))
+            for name in previous:
+                if name not in dataset:
+                    removed.append(self._ids[name])
+
+        pickle.dump((tuple(names), tuple(changes), tuple(removed)), self._fp, self._protocol)
+        self._previous = dataset
+        self.count += 1
+
+    def write_all(self, datasets: Iterator[Dict[str, Any]]) -> int:
+        """
+        Writes every dataset of a generator.
+
+        :param datasets: Dictionary generator.
+        :return: Number of datasets written.
+        """
+
+        for dataset in datasets:
+            self.write(dataset)
+
+        return self.count
+
+
+def read_deltas(fp: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Rebuilds the datasets of a stream written by DeltaWriter.
+
+    Values that did not change are shared by consecutive datasets.
+
+    :param fp: Binary file object.
+    :return: Dictionary generator.
+    """
+
+    # Every record is a separate pickle with its own memo, as written by DeltaWriter
+    try:
+        header = pickle.load(fp)
+    except EOFError:
+        raise ValueError("The stream has no header")
+    if header != (FORMAT, VERSION):
+        raise ValueError(f"Unknown stream format: {header!r}")
+
+    names = []
+    dataset = {}
+    while True:
+        try:
+            new_names, changes, removed = pickle.load(fp)
+        except EOFError:
+            return
+
+        names.extend(new_names)
+        for key in removed:
+            del dataset[names[key]]
+        for key, value in changes:
+            dataset[names[key]] = value
+
+        yield dict(dataset)
@@ -1,10 +1,38 @@
 from dataclasses import dataclass
-from typing import Union
+from typing import Union, Dict, Tuple
 
 from fields import Field
 
 
-@dataclass
+@dataclass(frozen=True)
 class SchemaField:
     attr_name: str
     data_generator: Union[Field.positive, Field.negative]
+    field: Field = None
+
+
+# Kinds of schema fields
+FIELD = 'field'
+NESTED = 'nested'
+
+
+@dataclass(frozen=True)
+class PlanField:
+    attr_name: str
+    field: Field
+    kind: str
+
+
+@dataclass(frozen=True)
+class SchemaPlan:
+    fields: Tuple[PlanField, ...]
+    positive_fields: Tuple[SchemaField, ...]
+    negative_fields: Tuple[SchemaField, ...]
+
+
+@dataclass(frozen=True)
+class Estimate:
+    positive: int
+    negative: int
+    negative_fields: Dict[str, int]
+    all_negative: int
@@ -1,15 +1,27 @@
 from typing import Iterable, Callable, Any, List, Union, Optional
-from string import ascii_letters
-from random import choice, randint
+from inspect import isgeneratorfunction
+from threading import local
 from datetime import datetime, date, timedelta
 
 from base import FieldABC, ValidatorABC
-from utils import is_iterable_but_not_string, Missing, ValuesStorage
+from utils import is_iterable_but_not_string, thread_local_property, Missing, MISSING, ValuesStorage
+from cache import cached_values, invalidate
+from primitives import current_stream
+
+
+def _random_word() -> str:
+    """Returns a random string of letters used as a value of a wrong type"""
+
+    stream = current_stream()
+    return stream.letters(stream.randint(5, 10))
 
 
 class Field(FieldABC):
     """Base class for data types"""
 
+    # Values of the last positive or negative call, every thread generates its own values
+    values = thread_local_property('values', ValuesStorage)
+
     def __init__(
         self,
         validate: (
@@ -22,6 +34,7 @@ class Field(FieldABC):
         allow_none: bool = True,
         required: bool = False,
         default: Any = None,
+        cache: bool = True,
     ):
         if validate is None:
             self.validators = []
@@ -40,7 +53,31 @@ class Field(FieldABC):
         self.default = default
         self.allow_none = allow_none
         self.required = required
-        self.values = ValuesStorage()
+        self.cache = cache
+        self._local = local()
+
+    def __init_subclass__(cls, **kwargs):
+        """Routes the values of field classes through the cache enabled by cache.set_cache_size"""
+
+        super().__init_subclass__(**kwargs)
+        for name, is_positive in (('positive', True), ('negative', False)):
+            method = cls.__dict__.get(name)
+            if method is not None and not isgeneratorfunction(method):
+                setattr(cls, name, cached_values(method, is_positive))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = local()
+
+    def invalidate(self):
+        """Removes the cached values of fields configured like this one"""
+
+        invalidate(self)
 
     def positive(self):
         self.values = ValuesStorage()
@@ -59,7 +96,7 @@ class Field(FieldABC):
             self._register(self.default)
 
         if not self.required:
-            self._register(Missing())
+            self._register(MISSING)
 
     def negative(self):
         self.values = ValuesStorage()
@@ -75,7 +112,7 @@ class Field(FieldABC):
             self._register(None)
 
         if self.required:
-            self._register(Missing())
+            self._register(MISSING)
 
     def generate(self, length):
         """Implement this method for the Length validator to work correctly"""
@@ -123,7 +160,7 @@ class String(Field):
             return self.values
 
         if not self.validators:
-            self._register(self.generate(length=randint(1, 10)))
+            self._register(self.generate(length=current_stream().randint(1, 10)))
 
         return self.values
 
@@ -133,7 +170,7 @@ class String(Field):
         if self.negative_data_from is not None:
             return self.values
 
-        self._register(randint(-100, 100))
+        self._register(current_stream().randint(-100, 100))
 
         return self.values
 
@@ -145,7 +182,7 @@ class String(Field):
         :return: String.
         """
 
-        return ''.join(choice(ascii_letters) for _ in range(length))
+        return current_stream().letters(length)
 
     def get_other_value(self, value: Optional[str]) -> str:
         if value is None:
@@ -167,7 +204,7 @@ class Integer(Field):
             return self.values
 
         if not self.validators:
-            self._register(randint(-100, 100))
+            self._register(current_stream().randint(-100, 100))
 
         return self.values
 
@@ -177,9 +214,7 @@ class Integer(Field):
         if self.negative_data_from is not None:
             return self.values
 
-        self._register(
-            ''.join(choice(ascii_letters) for _ in range(randint(5, 10)))
-        )
+        self._register(_random_word())
 
         return self.values
 
@@ -188,8 +223,8 @@ class Integer(Field):
 
     def get_other_value(self, value: Optional[int]) -> int:
         if value is None:
-            return randint(10, 100000)
-        return value + randint(10, 100000)
+            return current_stream().randint(10, 100000)
+        return value + current_stream().randint(10, 100000)
 
 
 class Float(Field):
@@ -206,7 +241,7 @@ class Float(Field):
             return self.values
 
         if not self.validators:
-            self._register(randint(-10000, 10000) / 100)
+            self._register(current_stream().randint(-10000, 10000) / 100)
 
         return self.values
 
@@ -216,9 +251,7 @@ class Float(Field):
         if self.negative_data_from is not None:
             return self.values
 
-        self._register(
-            ''.join(choice(ascii_letters) for _ in range(randint(5, 10)))
-        )
+        self._register(_random_word())
 
         return self.values
 
@@ -227,8 +260,8 @@ class Float(Field):
 
     def get_other_value(self, value: Optional[float]) -> float:
         if value is None:
-            return randint(1000000, 100000000) / 100
-        return value + randint(1000000, 100000000) / 100
+            return current_stream().randint(1000000, 100000000) / 100
+        return value + current_stream().randint(1000000, 100000000) / 100
 
 
 class Boolean(Field):
@@ -251,9 +284,7 @@ class Boolean(Field):
         if self.negative_data_from is not None:
             return self.values
 
-        self._register(
-            ''.join(choice(ascii_letters) for _ in range(randint(5, 10)))
-        )
+        self._register(_random_word())
 
         return self.values
 
@@ -277,7 +308,7 @@ class DateTime(Field):
             return self.values
 
         if not self.validators:
-            self._register(datetime.now())
+            self._register(current_stream().now())
 
         return self.values
 
@@ -296,8 +327,8 @@ class DateTime(Field):
 
     def get_other_value(self, value: Optional[datetime]) -> datetime:
         if value is None:
-            return datetime.now()
-        return value + timedelta(days=randint(1, 365), minutes=randint(1, 60))
+            return current_stream().now()
+        return value + timedelta(days=current_stream().randint(1, 365), minutes=current_stream().randint(1, 60))
 
 
 class Date(Field):
@@ -314,7 +345,7 @@ class Date(Field):
             return self.values
 
         if not self.validators:
-            self._register(datetime.now().date())
+            self._register(current_stream().now().date())
 
         return self.values
 
@@ -333,13 +364,15 @@ class Date(Field):
 
     def get_other_value(self, value: date) -> date:
         if value is None:
-            return datetime.now().date()
-        return value + timedelta(days=randint(1, 365))
+            return current_stream().now().date()
+        return value + timedelta(days=current_stream().randint(1, 365))
 
 
 class Collection(Field):
     """List view"""
 
+    inner_values = thread_local_property('inner_values', list)
+
     def __init__(self, data_type: Union[FieldABC, 'SGen'], *args, **kwargs):
         """
         Initializes the collection by adding a new data_type parameter to it
@@ -349,7 +382,6 @@ class Collection(Field):
 
         super().__init__(*args, **kwargs)
         self.data_type = data_type
-        self.inner_values = []
 
     def _register(self, for_register: Union[Any, List[Any]]):
         """
@@ -360,11 +392,8 @@ class Collection(Field):
         """
 
         if isinstance(for_register, list):
-            self.values.extend([
-                list(filter(lambda item: not isinstance(item, Missing), value))  # Filtering Missing within lists
-                for value in for_register
-                if list(filter(lambda item: not isinstance(item, Missing), value)) or not self.validators
-            ])
+            filtered = ([item for item in value if item is not MISSING] for value in for_register)  # Filtering Missing
+            self.values.extend([value for value in filtered if value or not self.validators])
         else:
             if for_register not in self.values:
                 self.values.append(for_register)
@@ -375,7 +404,7 @@ class Collection(Field):
         if self.positive_data_from is not None:
             return self.values
 
-        self.inner_values = self.data_type.positive()
+        self.inner_values = list(self.data_type.positive())
 
         for validator in self.validators:
             values = validator.positive(self)
@@ -383,8 +412,9 @@ class Collection(Field):
                 self._register(value)
 
         if not self.validators:
-            for value in self.inner_values:
-                self._register([[value for _ in range(randint(1, 5))]])
+            lengths = current_stream().ints(1, 5, len(self.inner_values))
+            for value, length in zip(self.inner_values, lengths):
+                self._register([[value] * length])
         return self.values
 
     def negative(self) -> List[Any]:
@@ -393,21 +423,22 @@ class Collection(Field):
         if self.negative_data_from is not None:
             return self.values
 
-        self.inner_values = self.data_type.positive()
+        self.inner_values = list(self.data_type.positive())
         for validator in self.validators:
             values = validator.negative(self)
             for value in values:
                 self._register(value)
 
-        self.inner_values = self.data_type.negative()
+        self.inner_values = list(self.data_type.negative())
         for validator in self.validators:
             values = validator.positive(self)
             for value in values:
                 self._register(value)
 
         if not self.validators:
-            for value in self.inner_values:
-                self._register([[value for _ in range(randint(1, 5))]])
+            lengths = current_stream().ints(1, 5, len(self.inner_values))
+            for value, length in zip(self.inner_values, lengths):
+                self._register([[value] * length])
 
         return self.values
 
@@ -426,15 +457,17 @@ class Collection(Field):
 class Nested(Field):
     """Entity View"""
 
-    def __init__(self, data_type: 'SGen', *args, **kwargs):
+    def __init__(self, data_type: 'SGen', shared: bool = False, *args, **kwargs):
         """
         Initializes a nested schema by adding a new data_type parameter to it
 
         :param data_type: Schema data type
+        :param shared: True if each distinct nested dictionary is built once and shared by all datasets
         """
 
         super().__init__(*args, **kwargs)
         self.data_type = data_type
+        self.shared = shared
 
     def positive(self):
         super().positive()
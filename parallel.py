@@ -0,0 +1,94 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterator, List, Optional
+
+from space import DatasetSpace
+
+# Dataset space of the current worker process
+_space: Optional[DatasetSpace] = None
+
+
+def _initialize(space: DatasetSpace):
+    """Stores the dataset space shipped to a worker process"""
+
+    global _space
+    _space = space
+
+
+def _generate_chunk(start: int, stop: int) -> List[Dict[str, Any]]:
+    """
+    Builds the datasets numbered from start to stop in a worker process.
+
+    The chunk is returned as a single list, so the field names shared by its
+    datasets are pickled once per chunk.
+
+    :param start: Number of the first dataset.
+    :param stop: Number of the dataset after the last one.
+    :return: List of dictionaries.
+    """
+
+    return list(_space[start:stop])
+
+
+def generate_parallel(
+        space: DatasetSpace,
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        chunk_size: int = 10000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Builds the datasets of a space in a pool of processes.
+
+    The field values are frozen in the space before it is shipped to the workers,
+    so every worker builds datasets from the same values. At most two chunks per
+    worker are in flight at a time.
+
+    :param space: Dataset space.
+    :param workers: Number of processes, the number of CPUs by default.
+    :param ordered: True if the datasets must be generated in the order of their numbers.
+    :param chunk_size: Number of datasets built by a worker at a time.
+    :return: Dictionary generator.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be positive")
+
+    chunks = (
+        (start, min(start + chunk_size, space.size))
+        for start in range(0, space.size, chunk_size)
+    )
+
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize, initargs=(space,)) as executor:
+        in_flight = workers * 2
+        pending = deque()
+
+        for start, stop in chunks:
+            pending.append(executor.submit(_generate_chunk, start, stop))
+
+            while len(pending) >= in_flight:
+                yield from _collect(pending, ordered)
+
+        while pending:
+            yield from _collect(pending, ordered)
+
+
+def _collect(pending: deque, ordered: bool) -> List[Dict[str, Any]]:
+    """
+    Waits for a chunk and removes it from the pending chunks.
+
+    :param pending: Futures of the chunks in the order of submission.
+    :param ordered: True if the oldest chunk must be returned.
+    :return: List of dictionaries.
+    """
+
+    if ordered:
+        return pending.popleft().result()
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    future = next(iter(done))
+    pending.remove(future)
+
+    return future.result()
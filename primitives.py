@@ -0,0 +1,163 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+import random as _random
+from random import Random
+from string import ascii_letters
+from typing import Any, Hashable, Iterator, List, Optional, Tuple
+
+# Random bytes below 208 = 4 * 52 map uniformly onto the letters, the others are dropped
+_ACCEPTED = 4 * len(ascii_letters)
+_LETTERS = bytes(ord(ascii_letters[byte % len(ascii_letters)]) for byte in range(_ACCEPTED)) + bytes(256 - _ACCEPTED)
+_REJECTED = bytes(range(_ACCEPTED, 256))
+
+# Current time of seeded streams, so their values do not depend on the clock
+SEEDED_NOW = datetime(2000, 1, 1)
+
+
+class RandomStream:
+    """Hands out random letters, integers and bytes in bulk"""
+
+    def __init__(self, random: Optional[Random] = None, buffer_size: int = 4096, key: Optional[Hashable] = None):
+        """
+        Initializes the stream
+
+        :param random: Random number generator, a new one seeded by the system if not passed.
+        :param buffer_size: Minimum number of letters generated at a time, 0 to keep no letters between calls.
+        :param key: Seed and field path of a seeded stream, None if the values are not reproducible.
+        """
+
+        self.random = random if random is not None else Random()
+        self.buffer_size = buffer_size
+        self.key = key
+        self._letters = ''
+        self._offset = 0
+
+    def letters(self, length: int) -> str:
+        """
+        Returns a string of random ASCII letters.
+
+        Letters are decoded from random bytes with bytes.translate and kept in a buffer,
+        so the cost does not depend on the number of Python calls per letter.
+
+        :param length: String length.
+        :return: String.
+        """
+
+        if not self.buffer_size:
+            letters = ''
+            while len(letters) < length:
+                raw = self.random.randbytes((length - len(letters)) * 5 // 4 + 64)
+                letters += raw.translate(_LETTERS, _REJECTED).decode('ascii')
+            return letters[:length]
+
+        while len(self._letters) - self._offset < length:
+            needed = max(self.buffer_size, length - len(self._letters) + self._offset)
+            # 13 of 16 bytes are accepted, request a little more to rarely loop
+            raw = self.random.randbytes(needed * 5 // 4 + 64)
+            self._letters = self._letters[self._offset:] + raw.translate(_LETTERS, _REJECTED).decode('ascii')
+            self._offset = 0
+
+        start = self._offset
+        self._offset += length
+
+        return self._letters[start:self._offset]
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        Returns a random integer N such that a <= N <= b.
+
+        :param a: Lower bound.
+        :param b: Upper bound.
+        :return: Integer.
+        """
+
+        return self.random.randint(a, b)
+
+    def ints(self, a: int, b: int, k: int) -> List[int]:
+        """
+        Returns k random integers N such that a <= N <= b in one call.
+
+        :param a: Lower bound.
+        :param b: Upper bound.
+        :param k: Number of integers.
+        :return: List of integers.
+        """
+
+        return self.random.choices(range(a, b + 1), k=k)
+
+    def now(self) -> datetime:
+        """
+        Returns the current local time, or SEEDED_NOW for seeded streams.
+
+        :return: Datetime.
+        """
+
+        return datetime.now() if self.key is None else SEEDED_NOW
+
+    def bytes(self, length: int) -> bytes:
+        """
+        Returns random bytes.
+
+        :param length: Number of bytes.
+        :return: Bytes.
+        """
+
+        return self.random.randbytes(length)
+
+
+# Stream of the field being generated with a seed
+_stream: ContextVar[Optional[RandomStream]] = ContextVar('sgen_stream', default=None)
+
+# Seed and path prefix of the nested schema being generated with a seed
+_scope: ContextVar[Tuple[Any, str]] = ContextVar('sgen_scope', default=(None, ''))
+
+
+# Stream of fields generated without a seed: it draws from the global generator of the random module
+# and keeps no letters between calls, so random.seed() reproduces their values
+_default = RandomStream(_random._inst, buffer_size=0)
+
+
+def current_stream() -> RandomStream:
+    """Returns the stream of the field being generated with a seed, otherwise the stream of the random module"""
+
+    stream = _stream.get()
+    if stream is not None:
+        return stream
+
+    return _default
+
+
+def current_scope() -> Tuple[Any, str]:
+    """Returns the seed and the path prefix set for nested schemas, the seed is None outside of them"""
+
+    return _scope.get()
+
+
+@contextmanager
+def seeded(seed: Any, path: str, is_positive: bool) -> Iterator[None]:
+    """
+    Makes fields use a stream derived from the seed and the field path, such as 'pet.name'.
+
+    Streams depend only on the seed and the path, so values do not depend on the order
+    in which fields are generated, nor on the process that generates them.
+    Does nothing if the seed is None.
+
+    :param seed: Seed of the schema.
+    :param path: Dotted path of the field in the schema.
+    :param is_positive: True for positive values, which are drawn from a separate stream.
+    """
+
+    if seed is None:
+        yield
+        return
+
+    direction = 'positive' if is_positive else 'negative'
+    random = Random(f'{seed}:{path}:{direction}')
+    stream_token = _stream.set(RandomStream(random, key=(seed, path)))
+    scope_token = _scope.set((seed, f'{path}.'))
+    try:
+        yield
+    finally:
+        _scope.reset(scope_token)
+        _stream.reset(stream_token)
@@ -1,14 +1,93 @@
 from inspect import getmembers
-from typing import List
+from collections.abc import Sequence
+from typing import List, Tuple, Dict, Any, Optional, Iterator, BinaryIO
 
-from fields import Field
-from dto import SchemaField
-from utils import Missing
+from fields import Field, Nested
+from dto import SchemaField, SchemaPlan, PlanField, Estimate, FIELD, NESTED
+from space import DatasetSpace, Product, shard_range
+from covering import covering_array
+from parallel import generate_parallel
+from aio import aiterate
+from compiler import compile_builder
+from columns import ColumnBatch, column_batches
+from corpus import Corpus, EncodedProduct
+from delta import DeltaWriter
+from primitives import seeded, current_scope
+
+PRODUCT = 'product'
+PAIRWISE = 'pairwise'
+STRATEGIES = (PRODUCT, PAIRWISE)
+
+DICT = 'dict'
+TUPLE = 'tuple'
+LAZY = 'lazy'
+ROW_FORMATS = (DICT, TUPLE, LAZY)
+
+LEXICOGRAPHIC = 'lexicographic'
+GRAY = 'gray'
+ORDERS = (LEXICOGRAPHIC, GRAY)
 
 
 class SGen:
     """Class for generating test data structures."""
 
+    # Maximum number of datasets positive() and negative() are allowed to generate
+    max_datasets: Optional[int] = None
+
+    # True if the instance generates datasets by compiled builders
+    _compiled: bool = False
+
+    # Seed of the random values of fields, None for values that differ on every run
+    seed: Any = None
+
+    def __init__(self, seed: Any = None):
+        """
+        Initializes the schema
+
+        :param seed: Seed of the random values of fields. Every field draws its values from a separate stream
+            derived from the seed and its path in the schema, so the datasets are the same on every run.
+        """
+
+        self.seed = seed
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._plan = cls._build_plan()
+        cls._builders = {}
+
+    @classmethod
+    def _build_plan(cls) -> SchemaPlan:
+        """
+        Collects the schema fields once, when the schema class is defined.
+
+        :return: SchemaPlan.
+        """
+
+        plan_fields = []
+
+        for attr_name, field in getmembers(cls, lambda member: isinstance(member, Field)):
+            plan_fields.append(PlanField(attr_name, field, NESTED if isinstance(field, Nested) else FIELD))
+
+        return SchemaPlan(
+            fields=tuple(plan_fields),
+            positive_fields=tuple(
+                SchemaField(
+                    attr_name=plan_field.attr_name,
+                    data_generator=plan_field.field.positive,
+                    field=plan_field.field,
+                )
+                for plan_field in plan_fields
+            ),
+            negative_fields=tuple(
+                SchemaField(
+                    attr_name=plan_field.attr_name,
+                    data_generator=plan_field.field.negative,
+                    field=plan_field.field,
+                )
+                for plan_field in plan_fields
+            ),
+        )
+
     def fields(self, is_positive: bool) -> List[SchemaField]:
         """
         Returns a list of schema fields and data generators for them.
@@ -17,72 +96,589 @@ class SGen:
         :return: List of SchemaField.
         """
 
-        method = 'positive' if is_positive else 'negative'
+        return list(self._plan.positive_fields if is_positive else self._plan.negative_fields)
 
-        schema_fields = getmembers(
+    def _columns(
             self,
-            lambda field: isinstance(field, Field)
-        )
+            is_positive: bool,
+            strategy: str = PRODUCT,
+            strength: int = 2,
+            shared: bool = False,
+    ) -> List[Tuple[str, Sequence]]:
+        """
+        Calls the generator of every schema field once and freezes its values.
+
+        Nested schemas are not enumerated: their values are represented by the
+        dataset space of the nested schema. Shared nested schemas are enumerated
+        once, so every distinct nested dictionary is a single object. With the
+        pairwise strategy nested values are the covering array of the nested schema.
+
+        :param is_positive: True if you need positive values.
+        :param strategy: Generation strategy.
+        :param strength: Strength of the covering array.
+        :param shared: True if all nested schemas must be shared.
+        :return: List of field names and their values.
+        """
+
+        columns = []
+
+        # Nested schemas take the seed of the outer schema
+        seed, prefix = current_scope()
+        if seed is None:
+            seed, prefix = self.seed, ''
+
+        for plan_field in self._plan.fields:
+            field = plan_field.field
+            data_from = field.positive_data_from if is_positive else field.negative_data_from
+
+            with seeded(seed, prefix + plan_field.attr_name, is_positive):
+                if plan_field.kind == NESTED and data_from is None:
+                    if strategy == PAIRWISE:
+                        method = field.data_type.positive if is_positive else field.data_type.negative
+                        values = tuple(method(strategy=strategy, strength=strength))
+                    elif field.shared or shared:
+                        values = tuple(field.data_type._space(is_positive, shared=True))
+                    else:
+                        values = field.data_type._space(is_positive)
+                else:
+                    values = tuple(field.positive() if is_positive else field.negative())
+
+            columns.append((plan_field.attr_name, values))
+
+        return columns
+
+    def _products(
+            self,
+            is_positive: bool,
+            strategy: str = PRODUCT,
+            strength: int = 2,
+            shared: bool = False,
+    ) -> List[Product]:
+        """
+        Returns the products whose datasets make up positive or negative test data.
+
+        Negative test data contains a product for each field with its negative values
+        and the positive values of the other fields, followed by the product of negative values.
+
+        :param is_positive: True if you need positive test data.
+        :param strategy: Generation strategy.
+        :param strength: Strength of the covering array.
+        :param shared: True if all nested schemas must be shared.
+        :return: List of products.
+        """
+
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown generation strategy: {strategy}")
+
+        if is_positive:
+            return [Product(self._columns(True, strategy, strength, shared))]
+
+        positive_columns = self._columns(True, strategy, strength, shared)
+        negative_columns = self._columns(False, strategy, strength, shared)
+
+        products = []
+        for n_name, n_values in negative_columns:
+            columns = [(n_name, n_values)]
+            for p_name, p_values in positive_columns:
+                if p_name == n_name:
+                    continue
+                columns.append((p_name, p_values))
+
+            products.append(Product(columns))
+
+        products.append(Product(negative_columns))
+
+        return products
+
+    def _generate(
+            self,
+            is_positive: bool,
+            strategy: str = PRODUCT,
+            strength: int = 2,
+            shard: Optional[int] = None,
+            num_shards: Optional[int] = None,
+            strided: bool = False,
+            row_format: str = DICT,
+            order: str = LEXICOGRAPHIC,
+            deltas: bool = False,
+    ):
+        """
+        Generates positive or negative datasets according to the strategy.
 
-        return [
-            SchemaField(attr_name=field[0], data_generator=getattr(field[1], method))
-            for field in schema_fields
+        :param is_positive: True if you need positive datasets.
+        :param strategy: Generation strategy.
+        :param strength: Strength of the covering array.
+        :param shard: Shard number, starting from zero.
+        :param num_shards: Number of shards.
+        :param strided: True if the shard takes every num_shards-th dataset.
+        :param row_format: 'dict' for dictionaries, 'tuple' for a header followed by tuples,
+            'lazy' for mappings decoded on access.
+        :param order: 'lexicographic' or 'gray'.
+        :param deltas: True if Gray code datasets are paired with the changed field.
+        :return: Dictionary or tuple generator.
+        """
+
+        if (shard is None) != (num_shards is None):
+            raise ValueError("The shard and num_shards parameters must be passed together")
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Unknown row format: {row_format}")
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order: {order}")
+        if deltas and order != GRAY:
+            raise ValueError("Deltas are only available in the gray order")
+        if order == GRAY and (strategy != PRODUCT or num_shards is not None or row_format != DICT):
+            raise ValueError("The gray order supports only unsharded dictionaries of the product strategy")
+
+        products = self._products(is_positive, strategy, strength)
+        header = self._names()
+
+        if strategy == PRODUCT:
+            space = DatasetSpace(products)
+            if num_shards is not None:
+                space = space.shard(shard, num_shards, strided=strided)
+
+            self._check_size(space.size)
+
+            if order == GRAY:
+                for product in products:
+                    for dataset, delta in product.gray():
+                        yield (dataset, delta) if deltas else dataset
+                return
+
+            if row_format == TUPLE:
+                yield header
+                yield from space.rows(header)
+                return
+
+            if row_format == LAZY:
+                yield from space.lazy()
+                return
+
+            if self._compiled and num_shards is None:
+                for product in products:
+                    if not product.size:
+                        continue
+                    # Builders would reuse the nested dictionaries of their inner loops across datasets
+                    if any(isinstance(table, DatasetSpace) for table in product.tables):
+                        yield from product.datasets(0, product.size)
+                    else:
+                        yield from self._builder(product)(*product.tables)
+                return
+
+            yield from space
+            return
+
+        selected = [
+            (product, indexes)
+            for product in products
+            for indexes in covering_array(list(product.radices), strength=strength)
         ]
 
-    def _generate(self, fields: List[SchemaField]):
+        numbers = range(len(selected))
+        if num_shards is not None:
+            numbers = shard_range(len(selected), shard, num_shards, strided=strided)
+
+        self._check_size(len(numbers))
+
+        if row_format == LAZY:
+            encoded = Corpus([
+                EncodedProduct.from_rows(product, [indexes for owner, indexes in selected if owner is product])
+                for product in products
+            ])
+            yield from encoded[numbers.start:numbers.stop:numbers.step].lazy()
+            return
+
+        if row_format == TUPLE:
+            yield header
+            positions = {id(product): [product.names.index(name) for name in header] for product in products}
+            for number in numbers:
+                product, indexes = selected[number]
+                yield product.values(indexes, positions[id(product)])
+            return
+
+        for number in numbers:
+            product, indexes = selected[number]
+            yield product.dataset(indexes)
+
+    def write_deltas(
+            self,
+            fp: BinaryIO,
+            is_positive: bool = True,
+            strategy: str = PRODUCT,
+            strength: int = 2,
+            order: Optional[str] = None,
+    ) -> int:
         """
-        Generates a Cartesian product of field values.
+        Writes a set of test data as a delta-encoded stream, read back by delta.read_deltas.
+
+        Every dataset is stored as the fields changed since the previous one. In the gray order
+        a single field changes per dataset, so the datasets are not compared.
 
-        :param fields: List of fields.
-        :return: Generator.
+        :param fp: Binary file object, for example opened with gzip.open.
+        :param is_positive: True if you need positive datasets.
+        :param strategy: 'product' or 'pairwise'.
+        :param strength: Strength of the covering array.
+        :param order: 'gray' or 'lexicographic'; the gray order needs the product strategy.
+            By default gray for the product strategy and lexicographic for the pairwise one.
+        :return: Number of datasets written.
         """
 
-        if len(fields) == 1:
-            for value in fields[0].data_generator():
-                yield [(fields[0].attr_name, value)]
-        else:
-            for value in fields[0].data_generator():
-                for rest in self._generate(fields=fields[1:]):
-                    yield [(fields[0].attr_name, value)] + rest
+        if order is None:
+            order = GRAY if strategy == PRODUCT else LEXICOGRAPHIC
 
-    def positive(self):
+        # Datasets are generated lazily, so the arguments are checked before the header is written
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown generation strategy: {strategy}")
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order: {order}")
+        if order == GRAY and strategy != PRODUCT:
+            raise ValueError("The gray order supports only unsharded dictionaries of the product strategy")
+
+        writer = DeltaWriter(fp)
+        if order == GRAY:
+            for dataset, delta in self._generate(is_positive, strategy, strength, order=GRAY, deltas=True):
+                writer.write(dataset, delta)
+            return writer.count
+
+        return writer.write_all(self._generate(is_positive, strategy, strength, order=order))
+
+    def materialize(
+            self,
+            is_positive: bool = True,
+            strategy: str = PRODUCT,
+            strength: int = 2,
+    ) -> Corpus:
+        """
+        Generates a set of test data as a compact corpus.
+
+        Each field is stored as a column of value positions in an array of the smallest
+        sufficient item size, next to a single table of field values. Dictionaries are
+        built only when the corpus is accessed.
+
+        :param is_positive: True if you need positive test data.
+        :param strategy: Generation strategy.
+        :param strength: Strength of the covering array.
+        :return: Corpus.
+        """
+
+        products = self._products(is_positive, strategy, strength)
+
+        if strategy == PRODUCT:
+            self._check_size(sum(product.size for product in products))
+            return Corpus([EncodedProduct.from_product(product) for product in products])
+
+        arrays = [covering_array(list(product.radices), strength=strength) for product in products]
+        self._check_size(sum(len(rows) for rows in arrays))
+
+        return Corpus([EncodedProduct.from_rows(product, rows) for product, rows in zip(products, arrays)])
+
+    def positive_batches(self, size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Generates a set of positive test data in lists of datasets.
+
+        :param size: Number of datasets in a batch, the last batch may be smaller.
+        :return: Generator of lists of dictionaries.
+        """
+
+        space = self.positive_space()
+        self._check_size(space.size)
+
+        yield from space.batches(size)
+
+    def negative_batches(self, size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Generates a set of negative test data in lists of datasets.
+
+        :param size: Number of datasets in a batch, the last batch may be smaller.
+        :return: Generator of lists of dictionaries.
+        """
+
+        space = self.negative_space()
+        self._check_size(space.size)
+
+        yield from space.batches(size)
+
+    def positive_columns(self, batch_size: int = 10000) -> Iterator[ColumnBatch]:
+        """
+        Generates a set of positive test data as column-oriented batches.
+
+        :param batch_size: Maximum number of datasets in a batch.
+        :return: ColumnBatch generator.
+        """
+
+        space = self.positive_space()
+        self._check_size(space.size)
+
+        yield from column_batches(space, self._names(), batch_size)
+
+    def negative_columns(self, batch_size: int = 10000) -> Iterator[ColumnBatch]:
+        """
+        Generates a set of negative test data as column-oriented batches.
+
+        :param batch_size: Maximum number of datasets in a batch.
+        :return: ColumnBatch generator.
+        """
+
+        space = self.negative_space()
+        self._check_size(space.size)
+
+        yield from column_batches(space, self._names(), batch_size)
+
+    def _names(self) -> Tuple[str, ...]:
+        """Returns the names of schema fields in the order of the plan"""
+
+        return tuple(plan_field.attr_name for plan_field in self._plan.fields)
+
+    def compile(self) -> 'SGen':
+        """
+        Switches the schema to builders generated for its field layout.
+
+        A builder is a function with a loop per field that builds datasets without
+        checking for Missing in fields that cannot be missing. Builders are compiled
+        once per schema class and field layout. Sharded and pairwise generation are
+        not affected, nor are products with nested schemas that are not shared, whose
+        nested dictionaries are built for every dataset.
+
+        :return: The same schema.
+        """
+
+        self._compiled = True
+
+        return self
+
+    def _builder(self, product: Product):
+        """
+        Returns the compiled builder of a product, compiling it on first use.
+
+        :param product: Product.
+        :return: Dictionary generator function.
+        """
+
+        key = (product.names, product.optional)
+
+        builder = self._builders.get(key)
+        if builder is None:
+            builder = self._builders[key] = compile_builder(*key)
+
+        return builder
+
+    def _check_size(self, size: int):
+        """
+        Checks that the number of datasets does not exceed max_datasets.
+
+        :param size: Number of datasets.
+        :raises ValueError: If the limit is exceeded.
+        """
+
+        if self.max_datasets is not None and size > self.max_datasets:
+            raise ValueError(
+                f"{type(self).__name__} would generate {size} datasets, the limit is {self.max_datasets}"
+            )
+
+    def count(self, is_positive: bool = True) -> int:
+        """
+        Calculates the number of datasets from the number of values of each field.
+
+        :param is_positive: True if you need the number of positive datasets.
+        :return: Number of datasets.
+        """
+
+        return DatasetSpace(self._products(is_positive=is_positive)).size
+
+    def estimate(self) -> Estimate:
+        """
+        Calculates the number of positive and negative datasets without generating them.
+
+        :return: Estimate.
+        """
+
+        positive = self._products(is_positive=True)
+        negative = self._products(is_positive=False)
+
+        return Estimate(
+            positive=sum(product.size for product in positive),
+            negative=sum(product.size for product in negative),
+            negative_fields={product.names[0]: product.size for product in negative[:-1]},
+            all_negative=negative[-1].size,
+        )
+
+    def _space(self, is_positive: bool, shared: bool = False) -> DatasetSpace:
+        """
+        Returns an indexable view over positive or negative test data.
+
+        :param is_positive: True if you need positive test data.
+        :param shared: True if all nested schemas must be shared.
+        :return: DatasetSpace.
+        """
+
+        return DatasetSpace(self._products(is_positive=is_positive, shared=shared))
+
+    def positive_space(self) -> DatasetSpace:
+        """
+        Returns an indexable view over the positive test data.
+
+        :return: DatasetSpace.
+        """
+
+        return self._space(is_positive=True)
+
+    def negative_space(self) -> DatasetSpace:
+        """
+        Returns an indexable view over the negative test data.
+
+        :return: DatasetSpace.
+        """
+
+        return self._space(is_positive=False)
+
+    def dataset_at(self, index: int, is_positive: bool = True) -> Dict[str, Any]:
+        """
+        Builds a single dataset without enumerating the previous ones.
+
+        :param index: Dataset number.
+        :param is_positive: True if you need a positive dataset.
+        :return: Dictionary.
+        """
+
+        space = self.positive_space() if is_positive else self.negative_space()
+
+        return space[index]
+
+    def sample(self, k: int, seed: Any = None, is_positive: bool = True) -> List[Dict[str, Any]]:
+        """
+        Draws k datasets uniformly at random without replacement.
+
+        :param k: Number of datasets.
+        :param seed: Seed of the random number generator that chooses the datasets.
+        :param is_positive: True if you need positive datasets.
+        :return: List of dictionaries.
+        """
+
+        space = self.positive_space() if is_positive else self.negative_space()
+
+        return space.sample(k, seed=seed)
+
+    def generate_parallel(
+            self,
+            mode: str = 'positive',
+            workers: Optional[int] = None,
+            ordered: bool = True,
+            chunk_size: int = 10000,
+    ):
+        """
+        Generates a set of test data in a pool of processes.
+
+        :param mode: 'positive' or 'negative'.
+        :param workers: Number of processes, the number of CPUs by default.
+        :param ordered: True if the datasets must be generated in the same order as positive()/negative().
+        :param chunk_size: Number of datasets built by a process at a time.
+        :return: Dictionary generator.
+        """
+
+        if mode not in ('positive', 'negative'):
+            raise ValueError(f"Unknown generation mode: {mode}")
+
+        space = self.positive_space() if mode == 'positive' else self.negative_space()
+        self._check_size(space.size)
+
+        yield from generate_parallel(space, workers=workers, ordered=ordered, chunk_size=chunk_size)
+
+    async def apositive(self, batch_size: int = 1000, queue_size: int = 4, **kwargs):
+        """
+        Asynchronously generates a set of positive test data.
+
+        Datasets are built in a worker thread and passed to the event loop in batches
+        through a bounded queue, so a slow consumer pauses the thread.
+
+        :param batch_size: Number of datasets passed to the event loop at a time.
+        :param queue_size: Maximum number of batches waiting for the consumer.
+        :param kwargs: Parameters of the positive method.
+        :return: Asynchronous dictionary generator.
+        """
+
+        async for dataset in aiterate(self.positive(**kwargs), batch_size=batch_size, queue_size=queue_size):
+            yield dataset
+
+    async def anegative(self, batch_size: int = 1000, queue_size: int = 4, **kwargs):
+        """
+        Asynchronously generates a set of negative test data.
+
+        Datasets are built in a worker thread and passed to the event loop in batches
+        through a bounded queue, so a slow consumer pauses the thread.
+
+        :param batch_size: Number of datasets passed to the event loop at a time.
+        :param queue_size: Maximum number of batches waiting for the consumer.
+        :param kwargs: Parameters of the negative method.
+        :return: Asynchronous dictionary generator.
+        """
+
+        async for dataset in aiterate(self.negative(**kwargs), batch_size=batch_size, queue_size=queue_size):
+            yield dataset
+
+    def positive(
+            self,
+            strategy: str = PRODUCT,
+            strength: int = 2,
+            shard: Optional[int] = None,
+            num_shards: Optional[int] = None,
+            strided: bool = False,
+            row_format: str = DICT,
+            order: str = LEXICOGRAPHIC,
+            deltas: bool = False,
+    ):
         """
         Generates a set of positive test data.
 
+        :param strategy: 'product' for all combinations of field values,
+            'pairwise' for a covering array of field values.
+        :param strength: Number of fields whose value combinations the covering array contains.
+        :param shard: Number of the shard to generate, starting from zero.
+        :param num_shards: Number of shards the datasets are split into.
+        :param strided: True if the shard takes every num_shards-th dataset instead of a contiguous range.
+        :param row_format: 'dict' for dictionaries, 'tuple' for a tuple of field names followed by
+            tuples of field values, where missing fields hold MISSING, 'lazy' for read-only
+            mappings whose values are decoded on access.
+        :param order: 'lexicographic' for the default order, 'gray' for an order where
+            consecutive datasets differ in exactly one field.
+        :param deltas: True if in the gray order every dataset is paired with the (field, old value, new value)
+            change from the previous dataset, None for the first dataset of every product.
         :return: Dictionary generator.
         """
 
-        for dataset in self._generate(fields=self.fields(is_positive=True)):
-            yield dict(filter(
-                lambda field_value: not isinstance(field_value[1], Missing),
-                dataset
-            ))
+        yield from self._generate(True, strategy, strength, shard, num_shards, strided, row_format, order, deltas)
 
-    def negative(self):
+    def negative(
+            self,
+            strategy: str = PRODUCT,
+            strength: int = 2,
+            shard: Optional[int] = None,
+            num_shards: Optional[int] = None,
+            strided: bool = False,
+            row_format: str = DICT,
+            order: str = LEXICOGRAPHIC,
+            deltas: bool = False,
+    ):
         """
         Generates a set of negative test data.
 
+        :param strategy: 'product' for all combinations of field values,
+            'pairwise' for a covering array of field values.
+        :param strength: Number of fields whose value combinations the covering array contains.
+        :param shard: Number of the shard to generate, starting from zero.
+        :param num_shards: Number of shards the datasets are split into.
+        :param strided: True if the shard takes every num_shards-th dataset instead of a contiguous range.
+        :param row_format: 'dict' for dictionaries, 'tuple' for a tuple of field names followed by
+            tuples of field values, where missing fields hold MISSING, 'lazy' for read-only
+            mappings whose values are decoded on access.
+        :param order: 'lexicographic' for the default order, 'gray' for an order where
+            consecutive datasets differ in exactly one field.
+        :param deltas: True if in the gray order every dataset is paired with the (field, old value, new value)
+            change from the previous dataset, None for the first dataset of every product.
         :return: List of dictionaries.
         """
 
-        positive_generators = self.fields(is_positive=True)
-        negative_generators = self.fields(is_positive=False)
+        yield from self._generate(False, strategy, strength, shard, num_shards, strided, row_format, order, deltas)
 
-        for n_gen in negative_generators:
-            fields = [n_gen]
-            for p_gen in positive_generators:
-                if p_gen.attr_name == n_gen.attr_name:
-                    continue
-                fields.append(p_gen)
-
-            for dataset in self._generate(fields=fields):
-                yield dict(filter(
-                    lambda field_value: not isinstance(field_value[1], Missing),
-                    dataset
-                ))
-
-        for dataset in self._generate(fields=self.fields(is_positive=False)):
-            yield dict(filter(
-                lambda field_value: not isinstance(field_value[1], Missing),
-                dataset
-            ))
+
+SGen._plan = SGen._build_plan()
+SGen._builders = {}
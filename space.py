@@ -0,0 +1,533 @@
+import sys
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from random import Random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils import MISSING, may_be_missing
+
+
+def size_of(values: Sequence) -> int:
+    """Returns the number of values, including spaces larger than sys.maxsize"""
+
+    if isinstance(values, DatasetSpace):
+        return values.size
+    return len(values)
+
+
+def shard_range(size: int, shard: int, num_shards: int, strided: bool = False) -> range:
+    """
+    Returns the dataset numbers of a shard.
+
+    Shards do not intersect and together cover all datasets. Contiguous shards
+    differ in size by at most one dataset.
+
+    :param size: Number of datasets.
+    :param shard: Shard number, starting from zero.
+    :param num_shards: Number of shards.
+    :param strided: True if the shard takes every num_shards-th dataset instead of a contiguous range.
+    :return: Range of dataset numbers.
+    """
+
+    if num_shards < 1:
+        raise ValueError("The number of shards must be positive")
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"The shard number must be between 0 and {num_shards - 1}")
+
+    if strided:
+        return range(shard, size, num_shards)
+
+    return range(size * shard // num_shards, size * (shard + 1) // num_shards)
+
+
+class Product:
+    """Cartesian product of field values enumerated in mixed-radix order"""
+
+    def __init__(self, columns: List[Tuple[str, Sequence]]):
+        """
+        Initializes the product
+
+        :param columns: List of field names and their values, the last field changes fastest.
+        """
+
+        self.names = tuple(name for name, _ in columns)
+        self.tables = tuple(values for _, values in columns)
+        self.positions = {name: position for position, name in enumerate(self.names)}
+        self.radices = tuple(size_of(table) for table in self.tables)
+        # Fields without MISSING among their values skip the check
+        self.optional = tuple(may_be_missing(table) for table in self.tables)
+        self.complete = not any(self.optional)
+
+        strides = []
+        size = 1
+        for radix in reversed(self.radices):
+            strides.append(size)
+            size *= radix
+
+        self.strides = tuple(reversed(strides))
+        self.size = size if self.tables else 0
+
+    def indexes(self, index: int) -> List[int]:
+        """
+        Decodes a dataset number into the positions of field values.
+
+        :param index: Dataset number within the product.
+        :return: List of value positions, one per field.
+        """
+
+        return [
+            index // stride % radix
+            for stride, radix in zip(self.strides, self.radices)
+        ]
+
+    def index_of(self, index: int, position: int) -> int:
+        """
+        Decodes the position of a single field value from a dataset number.
+
+        :param index: Dataset number within the product.
+        :param position: Field number.
+        :return: Position of the field value.
+        """
+
+        return index // self.strides[position] % self.radices[position]
+
+    def dataset(self, indexes: List[int]) -> Dict[str, Any]:
+        """
+        Builds a dataset from the positions of field values.
+
+        :param indexes: List of value positions, one per field.
+        :return: Dictionary.
+        """
+
+        if self.complete:
+            return {name: table[index] for name, table, index in zip(self.names, self.tables, indexes)}
+
+        dataset = {}
+        for name, table, index, optional in zip(self.names, self.tables, indexes, self.optional):
+            value = table[index]
+            if not optional or value is not MISSING:
+                dataset[name] = value
+
+        return dataset
+
+    def datasets(self, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+        """
+        Generates the datasets numbered from start to stop.
+
+        The odometer decodes start once and then moves one index vector.
+
+        :param start: Number of the first dataset.
+        :param stop: Number of the dataset after the last one.
+        :return: Dictionary generator.
+        """
+
+        if start >= stop:
+            return
+
+        indexes = self.indexes(start)
+        last = len(indexes) - 1
+
+        for _ in range(stop - start - 1):
+            yield self.dataset(indexes)
+
+            position = last
+            while indexes[position] + 1 == self.radices[position]:
+                indexes[position] = 0
+                position -= 1
+            indexes[position] += 1
+
+        yield self.dataset(indexes)
+
+    def gray(self) -> Iterator[Tuple[Dict[str, Any], Optional[Tuple[str, Any, Any]]]]:
+        """
+        Generates all datasets in reflected mixed-radix Gray code order.
+
+        Consecutive datasets differ in exactly one field, so a single dictionary is updated in place
+        and finding the changed field takes constant time (Knuth, Algorithm H).
+        The last field changes fastest, as in the default order, and the keys keep the order of the fields.
+
+        :return: Generator of (dataset, delta) pairs, where delta is (field, old value, new value)
+            and None for the first dataset. Missing values are reported as MISSING.
+        """
+
+        if not self.size:
+            return
+
+        # Digit 0 is the fastest one; fields with a single value never change
+        positions = [position for position in reversed(range(len(self.names))) if self.radices[position] > 1]
+        count = len(positions)
+        digits = [0] * count
+        directions = [1] * count
+        focus = list(range(count + 1))
+
+        indexes = [0] * len(self.names)
+        dataset = self.dataset(indexes)
+        yield dict(dataset), None
+
+        while True:
+            digit = focus[0]
+            focus[0] = 0
+            if digit == count:
+                return
+
+            position = positions[digit]
+            table = self.tables[position]
+            old = table[digits[digit]]
+            digits[digit] += directions[digit]
+            new = table[digits[digit]]
+            indexes[position] = digits[digit]
+
+            if digits[digit] == 0 or digits[digit] == self.radices[position] - 1:
+                directions[digit] = -directions[digit]
+                focus[digit] = focus[digit + 1]
+                focus[digit + 1] = digit + 1
+
+            name = self.names[position]
+            if new is MISSING:
+                del dataset[name]
+            elif old is MISSING:
+                # A field that comes back is rebuilt in its place instead of being appended
+                dataset = self.dataset(indexes)
+            else:
+                dataset[name] = new
+
+            yield dict(dataset), (name, old, new)
+
+    def values(self, indexes: List[int], positions: List[int]) -> tuple:
+        """
+        Builds a tuple of field values from the positions of field values.
+
+        :param indexes: List of value positions, one per field.
+        :param positions: Field numbers in the order of the tuple.
+        :return: Tuple of values, missing fields hold MISSING.
+        """
+
+        return tuple([self.tables[position][indexes[position]] for position in positions])
+
+    def rows(self, start: int, stop: int, positions: List[int]) -> Iterator[tuple]:
+        """
+        Generates the datasets numbered from start to stop as tuples of field values.
+
+        :param start: Number of the first dataset.
+        :param stop: Number of the dataset after the last one.
+        :param positions: Field numbers in the order of the tuple.
+        :return: Tuple generator.
+        """
+
+        if start >= stop:
+            return
+
+        tables = self.tables
+        indexes = self.indexes(start)
+        last = len(indexes) - 1
+
+        for _ in range(stop - start - 1):
+            yield tuple([tables[position][indexes[position]] for position in positions])
+
+            position = last
+            while indexes[position] + 1 == self.radices[position]:
+                indexes[position] = 0
+                position -= 1
+            indexes[position] += 1
+
+        yield tuple([tables[position][indexes[position]] for position in positions])
+
+    def fill(self, batch: List[Dict[str, Any]], start: int, stop: int):
+        """
+        Appends the datasets numbered from start to stop to a batch.
+
+        :param batch: List of dictionaries.
+        :param start: Number of the first dataset.
+        :param stop: Number of the dataset after the last one.
+        """
+
+        if start >= stop:
+            return
+
+        names, tables, radices = self.names, self.tables, self.radices
+        indexes = self.indexes(start)
+        last = len(indexes) - 1
+        append = batch.append
+        complete = self.complete
+
+        for _ in range(stop - start):
+            if complete:
+                dataset = {name: table[index] for name, table, index in zip(names, tables, indexes)}
+            else:
+                dataset = {}
+                for name, table, index in zip(names, tables, indexes):
+                    value = table[index]
+                    if value is not MISSING:
+                        dataset[name] = value
+            append(dataset)
+
+            position = last
+            while position >= 0 and indexes[position] + 1 == radices[position]:
+                indexes[position] = 0
+                position -= 1
+            if position >= 0:
+                indexes[position] += 1
+
+
+class LazyDataset(Mapping):
+    """Read-only dataset whose field values are decoded when accessed"""
+
+    __slots__ = ('_product', '_index')
+
+    def __init__(self, product: Product, index: int):
+        """
+        Initializes the dataset
+
+        :param product: Product the dataset belongs to.
+        :param index: Dataset number within the product.
+        """
+
+        self._product = product
+        self._index = index
+
+    def _value(self, position: int) -> Any:
+        return self._product.tables[position][self._product.index_of(self._index, position)]
+
+    def __getitem__(self, name: str) -> Any:
+        position = self._product.positions.get(name)
+        if position is None:
+            raise KeyError(name)
+
+        value = self._value(position)
+        if value is MISSING:
+            raise KeyError(name)
+
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for position, name in enumerate(self._product.names):
+            if self._value(position) is not MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"LazyDataset({dict(self)!r})"
+
+
+class DatasetSpace(Sequence):
+    """Indexable view over the datasets of one or more products"""
+
+    def __init__(self, products: List[Product], indices: range = None):
+        """
+        Initializes the view
+
+        :param products: Products in the order of their enumeration.
+        :param indices: Dataset numbers covered by the view, all datasets by default.
+        """
+
+        self.products = products
+        self.starts = []
+
+        total = 0
+        for product in products:
+            self.starts.append(total)
+            total += product.size
+
+        self.indices = range(total) if indices is None else indices
+
+    @property
+    def size(self) -> int:
+        """Number of datasets, may exceed sys.maxsize"""
+
+        start, stop, step = self.indices.start, self.indices.stop, self.indices.step
+        if step > 0:
+            return max(0, (stop - start + step - 1) // step)
+        return max(0, (start - stop - step - 1) // -step)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            view = type(self).__new__(type(self))
+            view.products = self.products
+            view.starts = self.starts
+            view.indices = self.indices[item]
+            return view
+
+        if item < 0:
+            item += self.size
+        if not 0 <= item < self.size:
+            raise IndexError("Dataset index out of range")
+
+        return self.dataset_at(self.indices.start + item * self.indices.step)
+
+    def dataset_at(self, index: int) -> Dict[str, Any]:
+        """
+        Builds a single dataset without enumerating the previous ones.
+
+        :param index: Dataset number in the whole space, regardless of the view.
+        :return: Dictionary.
+        """
+
+        number = bisect_right(self.starts, index) - 1
+        product = self.products[number]
+
+        return product.dataset(product.indexes(index - self.starts[number]))
+
+    def lazy(self) -> Iterator[LazyDataset]:
+        """
+        Generates the datasets of the view as lazy mappings.
+
+        A lazy dataset only holds its number, so generating it does not depend on the number of fields.
+
+        :return: LazyDataset generator.
+        """
+
+        if self.indices.step != 1:
+            for index in self.indices:
+                number = bisect_right(self.starts, index) - 1
+                yield LazyDataset(self.products[number], index - self.starts[number])
+            return
+
+        start, stop = self.indices.start, self.indices.stop
+        for product, product_start in zip(self.products, self.starts):
+            product_stop = product_start + product.size
+            if product_stop <= start or product_start >= stop:
+                continue
+
+            for index in range(max(start, product_start) - product_start, min(stop, product_stop) - product_start):
+                yield LazyDataset(product, index)
+
+    def rows(self, header: Tuple[str, ...]) -> Iterator[tuple]:
+        """
+        Generates the datasets of the view as tuples of field values.
+
+        :param header: Field names in the order of the tuple.
+        :return: Tuple generator, missing fields hold MISSING.
+        """
+
+        positions = [[product.names.index(name) for name in header] for product in self.products]
+
+        if self.indices.step != 1:
+            for index in self.indices:
+                number = bisect_right(self.starts, index) - 1
+                product = self.products[number]
+                yield product.values(product.indexes(index - self.starts[number]), positions[number])
+            return
+
+        start, stop = self.indices.start, self.indices.stop
+        for product, product_start, product_positions in zip(self.products, self.starts, positions):
+            product_stop = product_start + product.size
+            if product_stop <= start or product_start >= stop:
+                continue
+
+            yield from product.rows(
+                max(start, product_start) - product_start,
+                min(stop, product_stop) - product_start,
+                product_positions,
+            )
+
+    def batches(self, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Generates the datasets of the view in lists of batch_size dictionaries.
+
+        :param batch_size: Number of dictionaries in a batch, the last batch may be smaller.
+        :return: Generator of lists of dictionaries.
+        """
+
+        if batch_size < 1:
+            raise ValueError("The batch size must be positive")
+
+        if self.indices.step != 1:
+            batch = []
+            for dataset in self:
+                batch.append(dataset)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+
+        batch = []
+        start, stop = self.indices.start, self.indices.stop
+        for product, product_start in zip(self.products, self.starts):
+            position = max(start, product_start) - product_start
+            product_stop = min(stop, product_start + product.size) - product_start
+
+            while position < product_stop:
+                count = min(batch_size - len(batch), product_stop - position)
+                product.fill(batch, position, position + count)
+                position += count
+
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def shard(self, shard: int, num_shards: int, strided: bool = False) -> 'DatasetSpace':
+        """
+        Returns a view over one of num_shards disjoint parts of the space.
+
+        :param shard: Shard number, starting from zero.
+        :param num_shards: Number of shards.
+        :param strided: True if the shard takes every num_shards-th dataset instead of a contiguous range.
+        :return: DatasetSpace.
+        """
+
+        positions = shard_range(self.size, shard, num_shards, strided=strided)
+
+        return self[positions.start:positions.stop:positions.step]
+
+    def sample(self, k: int, seed: Any = None) -> List[Dict[str, Any]]:
+        """
+        Draws k datasets uniformly at random without replacement.
+
+        Only the drawn datasets are built, regardless of the size of the space.
+
+        :param k: Number of datasets.
+        :param seed: Seed of the random number generator.
+        :return: List of dictionaries.
+        """
+
+        size = self.size
+        if not 0 <= k <= size:
+            raise ValueError(f"Cannot draw {k} datasets from {size}")
+
+        random = Random(seed)
+
+        if size <= sys.maxsize:
+            positions = random.sample(range(size), k)
+        else:
+            positions = []
+            drawn = set()
+            while len(positions) < k:
+                position = random.randrange(size)
+                if position not in drawn:
+                    drawn.add(position)
+                    positions.append(position)
+
+        return [self[position] for position in positions]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self.indices.step != 1:
+            for index in self.indices:
+                yield self.dataset_at(index)
+            return
+
+        start, stop = self.indices.start, self.indices.stop
+        for product, product_start in zip(self.products, self.starts):
+            product_stop = product_start + product.size
+            if product_stop <= start or product_start >= stop:
+                continue
+
+            yield from product.datasets(
+                max(start, product_start) - product_start,
+                min(stop, product_stop) - product_start,
+            )
+
+    def __repr__(self):
+        return f"<DatasetSpace: {self.size} datasets>"
@@ -0,0 +1,131 @@
+import pytest
+
+from fields import Integer, String, Collection, Nested
+from validate import Length, OneOf, Range
+from sgen import SGen
+from cache import set_cache_size, clear_cache, _cache
+
+
+def strings(values):
+    return [value for value in values if isinstance(value, str)]
+
+
+@pytest.fixture(autouse=True)
+def enabled_cache():
+    set_cache_size(16)
+    clear_cache()
+    yield
+    set_cache_size(0)
+    clear_cache()
+
+
+def test_disabled_by_default():
+    set_cache_size(0)
+
+    assert len({strings(String().positive())[0] for _ in range(20)}) > 1
+    assert len(_cache) == 0
+
+
+def test_same_configuration_shares_values():
+    first = String(validate=Length(min=10, max=40)).positive()
+    second = String(validate=Length(min=10, max=40)).positive()
+
+    assert list(first) == list(second)
+    assert len(_cache) == 1
+
+
+def test_random_values_are_fixed_by_the_cache():
+    assert list(String().positive()) == list(String().positive())
+    assert list(Integer().negative()) == list(Integer().negative())
+
+
+def test_different_configurations():
+    Integer(validate=Range(min=18)).positive()
+    Integer(validate=Range(min=19)).positive()
+    Integer(validate=Range(min=18)).negative()
+    Integer(validate=Range(min=18), required=True).positive()
+    Integer(validate=OneOf(choices=[1])).positive()
+
+    assert list(Integer(validate=OneOf(choices=[True])).positive())[0] is True
+    assert len(_cache) == 6
+
+
+def test_opt_out():
+    field = String(cache=False)
+
+    assert len({strings(field.positive())[0] for _ in range(20)}) > 1
+    assert len(_cache) == 0
+
+
+def test_data_from_is_not_cached():
+    values = [1]
+    field = Integer(positive_data_from=lambda: values)
+
+    assert list(field.positive()) == [1]
+    values.append(2)
+    assert list(field.positive()) == [1, 2]
+    assert len(_cache) == 0
+
+
+def test_invalidate():
+    field = String()
+    field.positive()
+    field.negative()
+    Integer().positive()
+
+    String().invalidate()
+
+    assert len(_cache) == 1
+    field.positive()
+    assert len(_cache) == 2
+
+
+def test_clear_cache():
+    String().positive()
+    clear_cache()
+
+    assert len(_cache) == 0
+
+
+def test_size_bound():
+    set_cache_size(2)
+    for minimum in range(5):
+        Integer(validate=Range(min=minimum, max=10)).positive()
+
+    assert len(_cache) == 2
+
+    with pytest.raises(ValueError):
+        set_cache_size(-1)
+
+
+def test_cached_values_are_independent():
+    field = Integer(validate=OneOf(choices=[1, 2]))
+    field.positive().append(3)
+
+    assert 3 not in Integer(validate=OneOf(choices=[1, 2])).positive()
+
+
+def test_collection_and_nested():
+    class Pet(SGen):
+        name = String(validate=OneOf(choices=['a', 'b']))
+
+    class User(SGen):
+        tags = Collection(Integer(validate=OneOf(choices=[1])), validate=Length(min=1, max=2))
+        pet = Nested(Pet())
+
+    assert list(User().positive()) == list(User().positive())
+    assert list(User().negative()) == list(User().negative())
+
+
+def test_cached_collections_are_independent():
+    class Tagged(SGen):
+        tags = Collection(String(validate=OneOf(choices=['a'])), validate=Length(min=1, max=2))
+
+    rows = list(Tagged().positive())
+    for row in rows:
+        if isinstance(row.get('tags'), list):
+            row['tags'].append('POISON')
+    Tagged.tags.positive().append(['POISON'])
+
+    assert all('POISON' not in row['tags'] for row in Tagged().positive() if isinstance(row.get('tags'), list))
+    assert ['POISON'] not in Tagged.tags.positive()
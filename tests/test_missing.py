@@ -0,0 +1,49 @@
+import copy
+import pickle
+
+from fields import Integer, String, Collection
+from sgen import SGen
+from space import Product
+from utils import Missing, MISSING
+
+
+class User(SGen):
+    age = Integer(positive_data_from=lambda: [1, Missing()])
+    login = String(positive_data_from=lambda: ['x', 'y'])
+
+
+def test_single_instance():
+    assert Missing() is MISSING
+    assert Missing() is Missing()
+
+
+def test_instance_survives_pickling_and_copying():
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(MISSING, protocol)) is MISSING
+        assert pickle.loads(pickle.dumps([MISSING, {'a': MISSING}], protocol))[1]['a'] is MISSING
+
+    assert copy.copy(MISSING) is MISSING
+    assert copy.deepcopy([MISSING])[0] is MISSING
+
+
+def test_field_values_hold_the_instance():
+    assert [value for value in Integer(required=False).positive() if isinstance(value, Missing)] == [MISSING]
+    assert [value for value in String(required=True).negative() if isinstance(value, Missing)] == [MISSING]
+
+
+def test_collection_filters_missing_from_lists():
+    field = Collection(Integer(), positive_data_from=lambda: [[1, MISSING, 2], [MISSING]])
+
+    assert list(field.positive()) == [[1, 2], []]
+
+
+def test_optional_mask():
+    product = Product([('a', (1, 2)), ('b', (3, MISSING)), ('c', [MISSING])])
+
+    assert product.optional == (False, True, False)
+    assert not product.complete
+    assert Product([('a', (1, 2))]).complete
+
+
+def test_missing_fields_are_skipped():
+    assert list(User().positive()) == [{'age': 1, 'login': 'x'}, {'age': 1, 'login': 'y'}, {'login': 'x'}, {'login': 'y'}]
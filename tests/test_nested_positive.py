@@ -70,3 +70,41 @@ def test_nested_with_validators():
     ))
 
     assert len(datasets_from_sgen) == len(datasets_from_system_library)
+
+
+def test_nested_shared():
+    class Tag(SGen):
+        label = String(validate=OneOf(choices=['a', 'b']), allow_none=False, required=True)
+
+    class Pet(SGen):
+        age = Integer(validate=OneOf(choices=[1, 2, 3]), allow_none=False, required=True)
+        tag = Nested(Tag())
+
+    class Test(SGen):
+        name = String(validate=OneOf(choices=['x', 'y', 'z']))
+        pet = Nested(Pet(), shared=True)
+
+    datasets = list(Test().positive())
+    pets = {id(dataset['pet']): dataset['pet'] for dataset in datasets}
+    tags = {id(pet['tag']) for pet in pets.values()}
+
+    assert len(datasets) == 5 * 6
+    assert len(pets) == 6
+    assert len(tags) == 2
+    assert datasets == list(Test().materialize())
+
+    unshared = list(Nested(Pet()).positive())
+    assert unshared == list(pets.values())
+
+
+def test_nested_not_shared():
+    class Pet(SGen):
+        age = Integer(validate=OneOf(choices=[1, 2]), allow_none=False, required=True)
+
+    class Test(SGen):
+        name = String(validate=OneOf(choices=['x', 'y']))
+        pet = Nested(Pet())
+
+    datasets = list(Test().positive())
+
+    assert len({id(dataset['pet']) for dataset in datasets}) == len(datasets)
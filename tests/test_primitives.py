@@ -0,0 +1,86 @@
+from collections import Counter
+import random
+from random import Random
+from string import ascii_letters
+
+from fields import String, Collection, Integer
+from validate import Length
+from primitives import RandomStream, current_stream
+from sgen import SGen
+
+
+def test_letters():
+    stream = RandomStream(Random(1), buffer_size=16)
+
+    for length in (0, 1, 5, 16, 17, 1000):
+        value = stream.letters(length)
+        assert len(value) == length
+        assert set(value) <= set(ascii_letters)
+
+
+def test_letters_are_uniform():
+    counts = Counter(RandomStream(Random(2)).letters(52 * 2000))
+
+    assert set(counts) == set(ascii_letters)
+    assert all(1600 < count < 2400 for count in counts.values())
+
+
+def test_same_seed_same_values():
+    first, second = RandomStream(Random(3)), RandomStream(Random(3))
+
+    assert [first.letters(7) for _ in range(100)] == [second.letters(7) for _ in range(100)]
+    assert first.ints(1, 5, 50) == second.ints(1, 5, 50)
+    assert first.randint(-10, 10) == second.randint(-10, 10)
+    assert first.bytes(8) == second.bytes(8)
+
+
+def test_ints():
+    values = RandomStream(Random(4)).ints(1, 5, 1000)
+
+    assert len(values) == 1000
+    assert set(values) == {1, 2, 3, 4, 5}
+
+
+def test_unbuffered_letters():
+    stream = RandomStream(Random(5), buffer_size=0)
+
+    assert [len(stream.letters(length)) for length in (0, 1, 300)] == [0, 1, 300]
+    assert stream._letters == ''
+
+
+def test_random_seed_reproduces_values():
+    field = String(validate=Length(min=3, max=10))
+
+    random.seed(0)
+    first = list(field.positive())
+    random.seed(0)
+    second = list(field.positive())
+
+    assert current_stream().random is random._inst
+    assert first == second
+
+
+def test_long_strings():
+    values = [value for value in String(validate=Length(min=100000, max=100001)).positive() if isinstance(value, str)]
+
+    assert values
+    assert all(len(value) in (100000, 100001) and value.isalpha() for value in values)
+
+
+def test_collection_lengths():
+    values = [value for value in Collection(Integer(positive_data_from=lambda: [1, 2])).positive() if isinstance(value, list)]
+
+    assert [value[0] for value in values] == [1, 2]
+    assert all(1 <= len(value) <= 5 and len(set(value)) == 1 for value in values)
+
+
+def test_schema_collection_lengths():
+    class Pet(SGen):
+        name = String(positive_data_from=lambda: ['a'], negative_data_from=lambda: [1])
+
+    field = Collection(Pet())
+    positive = [value for value in field.positive() if isinstance(value, list)]
+    negative = [value for value in field.negative() if isinstance(value, list)]
+
+    assert positive and all(1 <= len(value) <= 5 and value[0] == {'name': 'a'} for value in positive)
+    assert negative and all(1 <= len(value) <= 5 for value in negative)
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from fields import Integer, String
+from sgen import SGen
+from aio import aiterate
+
+
+class User(SGen):
+    login = String(positive_data_from=lambda: ['x', 'y', 'z'], negative_data_from=lambda: [None])
+    score = Integer(positive_data_from=lambda: list(range(100)), negative_data_from=lambda: ['ten'])
+
+
+async def collect(datasets):
+    return [dataset async for dataset in datasets]
+
+
+def test_apositive():
+    assert asyncio.run(collect(User().apositive(batch_size=7))) == list(User().positive())
+
+
+def test_anegative():
+    assert asyncio.run(collect(User().anegative(batch_size=7, queue_size=1))) == list(User().negative())
+
+
+def test_kwargs():
+    datasets = asyncio.run(collect(User().apositive(shard=1, num_shards=3)))
+
+    assert datasets == list(User().positive(shard=1, num_shards=3))
+
+
+def test_backpressure():
+    produced = []
+
+    def datasets():
+        for index in range(10000):
+            produced.append(index)
+            yield {'index': index}
+
+    async def consume():
+        stream = aiterate(datasets(), batch_size=10, queue_size=2)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.3)
+        in_flight = len(produced)
+        await stream.aclose()
+        return first, in_flight
+
+    first, in_flight = asyncio.run(consume())
+
+    assert first == {'index': 0}
+    assert in_flight <= 10 * 4
+    assert len(produced) < 10000
+
+
+def test_producer_error():
+    def datasets():
+        yield {'index': 0}
+        raise RuntimeError('broken')
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(aiterate(datasets(), batch_size=1)))
@@ -0,0 +1,46 @@
+import pytest
+
+from fields import Integer, String, Nested
+from validate import OneOf
+from sgen import SGen
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']))
+
+
+class User(SGen):
+    login = String(validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+def test_space_batches():
+    for space in (User().positive_space(), User().negative_space(), User().materialize(is_positive=False)):
+        datasets = list(space)
+
+        for size in (1, 7, 64, 100000):
+            batches = list(space.batches(size))
+
+            assert sum(batches, []) == datasets
+            assert all(len(batch) == size for batch in batches[:-1])
+            assert 0 < len(batches[-1]) <= size
+
+
+def test_view_batches():
+    space = User().negative_space()
+    datasets = list(space)
+
+    assert sum(space[10:95].batches(8), []) == datasets[10:95]
+    assert sum(space[3::5].batches(8), []) == datasets[3::5]
+
+
+def test_sgen_batches():
+    assert sum(map(len, User().positive_batches(size=10))) == User().count()
+    assert sum(map(len, User().negative_batches(size=10))) == User().count(is_positive=False)
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        next(User().positive_batches(size=0))
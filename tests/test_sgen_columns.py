@@ -0,0 +1,110 @@
+import pytest
+
+from fields import Integer, String, Nested, Collection
+from validate import OneOf, Length
+from sgen import SGen
+from columns import column_batches
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']))
+
+
+class User(SGen):
+    login = String(validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+def rows(batches):
+    result = []
+    for batch in batches:
+        for position in range(len(batch)):
+            result.append({
+                name: batch.columns[name][position]
+                for name in batch.names
+                if batch.present[name][position]
+            })
+    return result
+
+
+def test_columns_match_datasets():
+    for space in (User().positive_space(), User().negative_space()):
+        for batch_size in (1, 7, 100, 10000):
+            batches = list(column_batches(space, ('login', 'pet', 'score'), batch_size))
+
+            assert rows(batches) == list(space)
+            assert all(len(batch) == batch_size for batch in batches[:-1])
+
+
+def test_views():
+    space = User().negative_space()[13:97]
+
+    assert rows(column_batches(space, ('login', 'pet', 'score'), 10)) == list(space)
+
+
+def test_presence_mask():
+    batch = next(User().positive_columns(batch_size=1000))
+
+    assert batch.names == ('login', 'pet', 'score')
+    assert len(batch) == User().count()
+    assert all(batch.present['pet'])
+    assert False in batch.present['login']
+    assert all(
+        value is None
+        for value, present in zip(batch.columns['login'], batch.present['login'])
+        if not present
+    )
+
+
+def test_negative_columns():
+    assert sum(len(batch) for batch in User().negative_columns(batch_size=9)) == User().count(is_positive=False)
+
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+
+    batch = next(User().positive_columns(batch_size=1000))
+    arrays = batch.to_numpy()
+
+    assert arrays['score'].dtype == numpy.int64 or arrays['score'].dtype == object
+    assert list(arrays['login'].mask) == [not present for present in batch.present['login']]
+
+    structured = batch.to_numpy(structured=True)
+    assert structured.dtype.names == batch.names
+    assert len(structured) == len(batch)
+
+
+def test_numpy_collections():
+    numpy = pytest.importorskip('numpy')
+
+    class Tagged(SGen):
+        tags = Collection(Integer(validate=OneOf(choices=[1, 2])), validate=Length(min=1, max=3))
+        score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+    for batches in (Tagged().positive_columns(), Tagged().negative_columns()):
+        for batch in batches:
+            arrays = batch.to_numpy()
+
+            assert arrays['tags'].dtype == object
+            assert [
+                value for value, present in zip(arrays['tags'].data, batch.present['tags']) if present
+            ] == [value for value, present in zip(batch.columns['tags'], batch.present['tags']) if present]
+            assert len(batch.to_numpy(structured=True)) == len(batch)
+
+
+def test_numpy_mixed_types():
+    numpy = pytest.importorskip('numpy')
+
+    class Mixed(SGen):
+        code = Integer(positive_data_from=lambda: [0, 'abc'], negative_data_from=lambda: [None])
+        flag = Integer(positive_data_from=lambda: [True, 5], negative_data_from=lambda: [None])
+
+    batch = next(Mixed().positive_columns())
+    arrays = batch.to_numpy()
+
+    assert arrays['code'].dtype == object
+    assert list(arrays['code'].data) == batch.columns['code']
+    assert [type(value) for value in arrays['flag'].data] == [bool, int, bool, int]
+    assert list(batch.to_numpy(structured=True)['code']) == batch.columns['code']
@@ -0,0 +1,66 @@
+from fields import Integer, String, Nested, Boolean
+from validate import OneOf
+from sgen import SGen
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']))
+
+
+class User(SGen):
+    is_admin = Boolean(allow_none=False, required=True)
+    login = String(validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+def test_compiled_positive():
+    assert list(User().compile().positive()) == list(User().positive())
+
+
+def test_compiled_negative():
+    compiled = list(User().compile().negative())
+    generic = list(User().negative())
+
+    assert len(compiled) == len(generic)
+    assert [list(dataset) for dataset in compiled] == [list(dataset) for dataset in generic]
+
+
+def test_wide_schema():
+    schema = type('Wide', (SGen,), {
+        f'field_{index:02}': Integer(
+            positive_data_from=(lambda: [1, 2]) if index % 2 else (lambda: [1]),
+            required=bool(index % 3),
+        )
+        for index in range(25)
+    })
+
+    assert list(schema().compile().positive()) == list(schema().positive())
+
+
+def test_builders_are_cached():
+    schema = User().compile()
+    list(schema.positive())
+    builders = dict(User._builders)
+    list(schema.positive())
+
+    assert User._builders == builders
+    assert not Pet._builders
+
+
+def test_compiled_nested_not_shared():
+    for datasets in (list(User().compile().positive()), list(User().compile().negative())):
+        pets = [dataset['pet'] for dataset in datasets if isinstance(dataset.get('pet'), dict)]
+        assert len({id(pet) for pet in pets}) == len(pets)
+
+    datasets = list(User().compile().positive())
+    datasets[0]['pet']['age'] = 100
+    assert all(dataset['pet'].get('age') != 100 for dataset in datasets[1:] if isinstance(dataset.get('pet'), dict))
+
+
+def test_compiled_nested_shared():
+    class SharedUser(User):
+        pet = Nested(Pet(), shared=True)
+
+    assert list(SharedUser().compile().positive()) == list(SharedUser().positive())
@@ -0,0 +1,66 @@
+import sys
+
+from fields import Integer, String, Nested
+from validate import OneOf
+from sgen import SGen
+from corpus import Corpus, typecode_for
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']))
+
+
+class User(SGen):
+    login = String(validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: list(range(300)), negative_data_from=lambda: ['ten'])
+
+
+def test_typecode():
+    assert typecode_for(2) == 'B'
+    assert typecode_for(256) == 'B'
+    assert typecode_for(257) == 'H'
+    assert typecode_for(70000) in ('I', 'L')
+
+
+def test_materialize():
+    schema = User()
+
+    for is_positive in (True, False):
+        corpus = schema.materialize(is_positive=is_positive)
+        datasets = [corpus[index] for index in range(len(corpus))]
+
+        assert isinstance(corpus, Corpus)
+        assert len(corpus) == schema.count(is_positive=is_positive)
+        assert list(corpus) == datasets
+        assert list(corpus[5:40:3]) == datasets[5:40:3]
+        assert corpus[-1] == datasets[-1]
+        assert isinstance(corpus[5:40], Corpus)
+
+
+def test_codes():
+    corpus = User().materialize()
+    product = corpus.products[0]
+
+    assert [column.typecode for column in product.codes] == ['B', 'B', 'H']
+    assert corpus.nbytes == len(corpus) * 4
+
+
+def test_pairwise():
+    corpus = User().materialize(strategy='pairwise')
+
+    assert list(corpus) == [corpus[index] for index in range(len(corpus))]
+    assert len(corpus) < User().count()
+
+
+def test_memory():
+    schema = type('Wide', (SGen,), {
+        f'field_{index:02}': Integer(validate=OneOf(choices=[1, 2, 3]), allow_none=False, required=True)
+        for index in range(10)
+    })()
+
+    corpus = schema.materialize()
+    datasets = list(corpus[:10000])
+
+    assert corpus.nbytes * 10 < sum(map(sys.getsizeof, datasets)) * len(corpus) / 10000
@@ -0,0 +1,123 @@
+import gzip
+import io
+import pickle
+
+import pytest
+
+from fields import Integer, String, Nested, Collection
+from validate import OneOf
+from sgen import SGen
+from delta import DeltaWriter, read_deltas
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']), negative_data_from=lambda: [1])
+
+
+class User(SGen):
+    login = String(required=False, validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+def canonical(datasets):
+    return [sorted(dataset.items()) for dataset in datasets]
+
+
+@pytest.mark.parametrize('is_positive', [True, False])
+@pytest.mark.parametrize('order', ['gray', 'lexicographic'])
+def test_round_trip(is_positive, order):
+    user = User()
+    fp = io.BytesIO()
+
+    count = user.write_deltas(fp, is_positive=is_positive, order=order)
+    fp.seek(0)
+    datasets = list(read_deltas(fp))
+
+    method = user.positive if is_positive else user.negative
+    assert count == len(datasets)
+    assert canonical(datasets) == canonical(method(order=order))
+
+
+def test_pairwise_round_trip():
+    user = User()
+    fp = io.BytesIO()
+
+    user.write_deltas(fp, strategy='pairwise', order='lexicographic')
+    fp.seek(0)
+
+    assert canonical(read_deltas(fp)) == canonical(user.positive(strategy='pairwise'))
+
+
+def test_pairwise_default_order():
+    user = User()
+    fp = io.BytesIO()
+
+    user.write_deltas(fp, strategy='pairwise')
+    fp.seek(0)
+
+    assert canonical(read_deltas(fp)) == canonical(user.positive(strategy='pairwise'))
+
+
+@pytest.mark.parametrize('strategy, order', [('pairwise', 'gray'), ('product', 'random'), ('random', None)])
+def test_invalid_arguments_write_nothing(strategy, order):
+    fp = io.BytesIO()
+
+    with pytest.raises(ValueError):
+        User().write_deltas(fp, strategy=strategy, order=order)
+
+    assert fp.getvalue() == b''
+
+
+def test_gzip_round_trip():
+    fp = io.BytesIO()
+    with gzip.GzipFile(fileobj=fp, mode='wb') as output:
+        User().write_deltas(output)
+    fp.seek(0)
+
+    with gzip.GzipFile(fileobj=fp, mode='rb') as source:
+        assert canonical(read_deltas(source)) == canonical(User().positive(order='gray'))
+
+
+def test_smaller_than_full_rows():
+    fp = io.BytesIO()
+    User().write_deltas(fp)
+
+    full = sum(len(pickle.dumps(dataset, pickle.HIGHEST_PROTOCOL)) for dataset in User().positive())
+
+    assert len(fp.getvalue()) < full
+
+
+def test_writer_detects_type_changes():
+    datasets = [{'a': 1, 'b': [1]}, {'a': True, 'b': [True]}, {'b': [True]}, {'a': 1.0, 'b': [True]}]
+    fp = io.BytesIO()
+
+    assert DeltaWriter(fp).write_all(iter(datasets)) == 4
+    fp.seek(0)
+    result = list(read_deltas(fp))
+
+    assert result == datasets
+    assert [type(dataset.get('a')) for dataset in result] == [int, bool, type(None), float]
+    assert [type(dataset['b'][0]) for dataset in result] == [int, bool, bool, bool]
+
+
+def test_unknown_stream():
+    with pytest.raises(ValueError):
+        list(read_deltas(io.BytesIO(pickle.dumps(('other', 1)))))
+    with pytest.raises(ValueError):
+        list(read_deltas(io.BytesIO()))
+
+
+def test_repeated_objects_round_trip():
+    class Tagged(SGen):
+        tags = Collection(String(), negative_data_from=lambda: [['abc', 'abc'], 'abc'])
+        score = Integer(positive_data_from=lambda: [1], negative_data_from=lambda: ['one'])
+
+    datasets = [{'a': ['abc', 'abc']}, {'a': ['abc', 'abc'], 'b': 'abc'}] + list(Tagged(seed=3).negative())
+    fp = io.BytesIO()
+
+    DeltaWriter(fp).write_all(iter(datasets))
+    fp.seek(0)
+
+    assert list(read_deltas(fp)) == datasets
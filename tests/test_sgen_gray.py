@@ -0,0 +1,98 @@
+import pytest
+
+from fields import Integer, String, Nested
+from validate import OneOf
+from sgen import SGen
+from utils import Missing
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']), negative_data_from=lambda: [1])
+
+
+class User(SGen):
+    login = String(required=False, validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+def changed_fields(previous, current):
+    return {
+        name for name in previous.keys() | current.keys()
+        if name not in previous or name not in current or previous[name] != current[name]
+    }
+
+
+def canonical(dataset):
+    return repr(sorted(dataset.items()))
+
+
+@pytest.mark.parametrize('method', ['positive', 'negative'])
+def test_gray_order_contains_every_dataset(method):
+    user = User()
+
+    expected = list(getattr(user, method)())
+    datasets = list(getattr(user, method)(order='gray'))
+
+    assert len(datasets) == len(expected)
+    assert sorted(map(canonical, datasets)) == sorted(map(canonical, expected))
+
+
+def test_gray_order_changes_one_field():
+    datasets = list(User().positive(order='gray'))
+
+    for previous, current in zip(datasets, datasets[1:]):
+        assert len(changed_fields(previous, current)) == 1
+
+
+def test_gray_deltas():
+    rows = list(User().positive(order='gray', deltas=True))
+
+    assert rows[0][1] is None
+    for (previous, _), (current, delta) in zip(rows, rows[1:]):
+        name, old, new = delta
+        assert changed_fields(previous, current) == {name}
+        assert previous.get(name, old) == old
+        assert current.get(name, new) == new
+        assert isinstance(old, Missing) == (name not in previous)
+        assert isinstance(new, Missing) == (name not in current)
+
+
+def test_gray_deltas_restart_per_product():
+    rows = list(User().negative(order='gray', deltas=True))
+    products = User()._products(False, 'product', 2)
+
+    starts = [0]
+    for product in products:
+        starts.append(starts[-1] + product.size)
+
+    assert [number for number, (_, delta) in enumerate(rows) if delta is None] == [
+        start for start, product in zip(starts, products) if product.size
+    ]
+
+
+def test_gray_datasets_are_independent():
+    datasets = list(User().positive(order='gray'))
+    datasets[0]['score'] = 0
+
+    assert datasets[1]['score'] != 0
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'order': 'random'},
+    {'deltas': True},
+    {'order': 'gray', 'strategy': 'pairwise'},
+    {'order': 'gray', 'shard': 0, 'num_shards': 2},
+    {'order': 'gray', 'row_format': 'tuple'},
+])
+def test_gray_invalid_parameters(kwargs):
+    with pytest.raises(ValueError):
+        list(User().positive(**kwargs))
+
+
+def test_gray_key_order():
+    datasets = list(User().negative(order='gray'))
+    expected = {canonical(dataset): list(dataset) for dataset in User().negative()}
+
+    assert all(list(dataset) == expected[canonical(dataset)] for dataset in datasets)
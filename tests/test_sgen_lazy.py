@@ -0,0 +1,64 @@
+from collections.abc import Mapping
+
+import pytest
+
+from fields import Integer, String, Nested
+from validate import OneOf
+from sgen import SGen
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']), negative_data_from=lambda: [1])
+
+
+class User(SGen):
+    login = String(validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+class Optional(SGen):
+    name = String(required=False, validate=OneOf(choices=['a']))
+
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'shard': 1, 'num_shards': 3},
+    {'shard': 2, 'num_shards': 3, 'strided': True},
+    {'strategy': 'pairwise'},
+    {'strategy': 'pairwise', 'shard': 0, 'num_shards': 2, 'strided': True},
+])
+def test_lazy_rows(kwargs):
+    user = User()
+
+    for method in ('positive', 'negative'):
+        expected = list(getattr(user, method)(**kwargs))
+        rows = list(getattr(user, method)(row_format='lazy', **kwargs))
+
+        assert all(isinstance(row, Mapping) for row in rows)
+        assert [dict(row) for row in rows] == expected
+        assert rows == expected
+
+
+def test_lazy_row_access():
+    row = next(User().positive(row_format='lazy'))
+
+    assert row['login'] == 'x'
+    assert row['score'] == 10
+    assert row['pet'] == {'age': 1, 'name': 'a'}
+    assert 'login' in row
+    assert 'unknown' not in row
+    assert len(row) == 3
+    with pytest.raises(KeyError):
+        row['unknown']
+
+
+def test_lazy_missing_field():
+    rows = list(Optional().positive(row_format='lazy'))
+
+    assert [dict(row) for row in rows] == list(Optional().positive())
+    assert 'name' not in rows[-1]
+    assert len(rows[-1]) == 0
+    with pytest.raises(KeyError):
+        rows[-1]['name']
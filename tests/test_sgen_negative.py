@@ -0,0 +1,49 @@
+from fields import Integer, String
+from validate import OneOf
+from sgen import SGen
+
+
+def test_phases():
+    class Test(SGen):
+        age = Integer(
+            validate=OneOf(choices=[1, 2]),
+            negative_data_from=lambda: ['x'],
+            allow_none=False,
+            required=True,
+        )
+        name = String(
+            positive_data_from=lambda: ['a', 'b', 'c'],
+            negative_data_from=lambda: [0, 1],
+        )
+
+    assert list(Test().negative()) == [
+        {'age': 'x', 'name': 'a'},
+        {'age': 'x', 'name': 'b'},
+        {'age': 'x', 'name': 'c'},
+        {'name': 0, 'age': 1},
+        {'name': 0, 'age': 2},
+        {'name': 1, 'age': 1},
+        {'name': 1, 'age': 2},
+        {'age': 'x', 'name': 0},
+        {'age': 'x', 'name': 1},
+    ]
+
+
+def test_field_values_are_generated_once():
+    calls = {'positive': 0, 'negative': 0}
+
+    def positive():
+        calls['positive'] += 1
+        return ['a', 'b']
+
+    def negative():
+        calls['negative'] += 1
+        return [0]
+
+    class Test(SGen):
+        age = Integer()
+        name = String(positive_data_from=positive, negative_data_from=negative)
+
+    list(Test().negative())
+
+    assert calls == {'positive': 1, 'negative': 1}
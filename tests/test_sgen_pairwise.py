@@ -0,0 +1,115 @@
+from itertools import combinations, product
+
+import pytest
+
+from fields import Integer, String, Boolean, Nested
+from validate import OneOf
+from sgen import SGen
+from covering import covering_array
+
+ABSENT = object()
+
+
+class Wide(SGen):
+    locals().update({
+        f'field_{index:02}': Integer(validate=OneOf(choices=list(range(index % 3 + 2))))
+        for index in range(30)
+    })
+
+
+def assert_covered(datasets, columns, strength):
+    for chosen in combinations(columns, strength):
+        seen = {
+            tuple(dataset.get(name, ABSENT) for name, _ in chosen)
+            for dataset in datasets
+        }
+        expected = set(product(*(
+            [ABSENT if value.__class__.__name__ == 'Missing' else value for value in values]
+            for _, values in chosen
+        )))
+        assert expected <= seen
+
+
+def test_covering_array():
+    for radices, strength in [([3, 3, 3, 3], 2), ([2] * 10, 3), ([3, 2, 4, 1, 5], 3), ([5, 4], 3), ([3, 3], 1)]:
+        rows = covering_array(radices, strength=strength)
+
+        for parameters in combinations(range(len(radices)), min(strength, len(radices))):
+            seen = {tuple(row[parameter] for parameter in parameters) for row in rows}
+            assert seen == set(product(*(range(radices[parameter]) for parameter in parameters)))
+
+
+def test_covering_array_empty():
+    assert covering_array([3, 0, 2]) == []
+    assert covering_array([]) == []
+
+    with pytest.raises(ValueError):
+        covering_array([2, 2], strength=0)
+
+
+def test_positive_pairwise():
+    schema = Wide()
+    columns = schema._columns(is_positive=True)
+
+    datasets = list(schema.positive(strategy='pairwise'))
+
+    assert len(datasets) < 200
+    assert_covered(datasets, columns, strength=2)
+
+
+def test_positive_three_wise():
+    class Test(SGen):
+        age = Integer(validate=OneOf(choices=[1, 2, 3]))
+        name = String(positive_data_from=lambda: ['a', 'b'])
+        is_admin = Boolean()
+        score = Integer(validate=OneOf(choices=[10, 20]), required=True)
+
+    schema = Test()
+    datasets = list(schema.positive(strategy='pairwise', strength=3))
+
+    assert len(datasets) < schema.positive_space().size
+    assert_covered(datasets, schema._columns(is_positive=True), strength=3)
+
+
+def test_negative_pairwise():
+    class Test(SGen):
+        locals().update({
+            f'field_{index:02}': Integer(
+                positive_data_from=lambda index=index: list(range(index % 3 + 2)),
+                negative_data_from=lambda index=index: [f'wrong_{value}' for value in range(index % 2 + 1)],
+            )
+            for index in range(12)
+        })
+
+    schema = Test()
+    datasets = list(schema.negative(strategy='pairwise'))
+
+    start = 0
+    for negative_product in schema._products(is_positive=False):
+        stop = start + len(covering_array(list(negative_product.radices)))
+        columns = list(zip(negative_product.names, negative_product.tables))
+        assert_covered(datasets[start:stop], columns, strength=2)
+        start = stop
+
+    assert start == len(datasets)
+
+
+def test_nested_pairwise():
+    class Pet(SGen):
+        age = Integer(validate=OneOf(choices=[1, 2, 3]))
+        name = String(positive_data_from=lambda: ['a', 'b'])
+        is_cat = Boolean()
+
+    class User(SGen):
+        pet = Nested(Pet())
+        score = Integer(validate=OneOf(choices=[10, 20]))
+
+    datasets = list(User().positive(strategy='pairwise'))
+    pets = list(Pet().positive(strategy='pairwise'))
+
+    assert len(datasets) == len(pets) * 4
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        list(Wide().positive(strategy='random'))
@@ -0,0 +1,47 @@
+import pytest
+
+from fields import Integer, String, Nested, Collection
+from sgen import SGen
+from parallel import generate_parallel
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    tags = Collection(data_type=String(positive_data_from=lambda: ['cat', 'dog']))
+
+
+class User(SGen):
+    login = String()
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+def test_ordered():
+    for space in (User().positive_space(), User().negative_space()):
+        assert list(generate_parallel(space, workers=2, chunk_size=7)) == list(space)
+
+
+def test_unordered():
+    space = User().negative_space()
+
+    datasets = list(generate_parallel(space, workers=3, ordered=False, chunk_size=5))
+
+    assert sorted(map(repr, datasets)) == sorted(map(repr, space))
+
+
+def test_modes():
+    schema = User()
+
+    assert len(list(schema.generate_parallel(workers=2))) == schema.count()
+    assert len(list(schema.generate_parallel(mode='negative', workers=2))) == schema.count(is_positive=False)
+
+
+def test_consistent_values():
+    datasets = list(User().generate_parallel(workers=2, chunk_size=3))
+
+    assert len({dataset.get('login') for dataset in datasets if 'login' in dataset} - {None}) == 1
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        next(User().generate_parallel(mode='all'))
@@ -0,0 +1,109 @@
+from itertools import product
+
+import pytest
+
+from fields import Integer, String, Boolean
+from validate import OneOf
+from sgen import SGen
+
+
+def test_product_order():
+    class Test(SGen):
+        age = Integer(validate=OneOf(choices=[1, 2]), allow_none=False, required=True)
+        is_admin = Boolean(allow_none=False, required=True)
+        name = String(positive_data_from=lambda: ['a', 'b', 'c'])
+
+    datasets = list(Test().positive())
+    expected = [
+        {'age': age, 'is_admin': is_admin, 'name': name}
+        for age, is_admin, name in product([1, 2], [True, False], ['a', 'b', 'c'])
+    ]
+
+    assert datasets == expected
+
+
+def test_missing_is_skipped():
+    class Test(SGen):
+        age = Integer(validate=OneOf(choices=[1]), allow_none=False)
+        name = String(positive_data_from=lambda: ['a'])
+
+    assert list(Test().positive()) == [{'age': 1, 'name': 'a'}, {'name': 'a'}]
+
+
+def test_empty_field_values():
+    class Test(SGen):
+        age = Integer()
+        name = String(positive_data_from=lambda: [])
+
+    assert list(Test().positive()) == []
+
+
+def test_wide_schema():
+    field_count = 3000
+    schema = type('Wide', (SGen,), {
+        f'field_{index:05}': Integer(validate=OneOf(choices=[1, 2]), allow_none=False, required=True)
+        for index in range(field_count)
+    })()
+
+    datasets = schema.positive()
+    first = next(datasets)
+    second = next(datasets)
+
+    assert len(first) == field_count
+    assert first['field_02999'] == 1
+    assert second['field_02999'] == 2
+    assert second['field_02998'] == 1
+
+
+def test_field_values_are_generated_once():
+    calls = []
+
+    def names():
+        calls.append(1)
+        return ['a', 'b']
+
+    class Test(SGen):
+        age = Integer(validate=OneOf(choices=[1, 2, 3]), allow_none=False, required=True)
+        name = String(positive_data_from=names)
+        nick = String(allow_none=False, required=True)
+
+    datasets = list(Test().positive())
+
+    assert len(calls) == 1
+    assert len(datasets) == 6
+    assert len({dataset['nick'] for dataset in datasets}) == 1
+
+
+def test_plan_is_built_once(monkeypatch):
+    import sgen
+    from fields import Nested
+    from dto import NESTED, FIELD
+
+    class Pet(SGen):
+        name = String()
+
+    class Test(SGen):
+        age = Integer()
+        pet = Nested(Pet())
+
+    def getmembers(*args, **kwargs):
+        raise AssertionError('Schema fields must not be collected again')
+
+    monkeypatch.setattr(sgen, 'getmembers', getmembers)
+
+    assert [plan_field.kind for plan_field in Test._plan.fields] == [FIELD, NESTED]
+    assert len(list(Test().positive())) == 3 * 3
+    assert len(list(Test().negative())) > 0
+    assert [field.attr_name for field in Test().fields(is_positive=True)] == ['age', 'pet']
+
+
+def test_schema_fields_are_frozen():
+    from dataclasses import FrozenInstanceError
+
+    class Test(SGen):
+        age = Integer()
+
+    with pytest.raises(FrozenInstanceError):
+        Test().fields(True)[0].attr_name = 'x'
+
+    assert [field.attr_name for field in Test().fields(True)] == ['age']
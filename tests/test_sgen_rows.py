@@ -0,0 +1,57 @@
+import pytest
+
+from fields import Integer, String, Nested
+from validate import OneOf
+from sgen import SGen
+from utils import MISSING
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b']), negative_data_from=lambda: [1])
+
+
+class User(SGen):
+    login = String(validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten'])
+
+
+def to_dicts(rows):
+    header = next(rows)
+    return [
+        {name: value for name, value in zip(header, row) if value is not MISSING}
+        for row in rows
+    ]
+
+
+def test_header():
+    rows = User().positive(row_format='tuple')
+
+    assert next(rows) == ('login', 'pet', 'score')
+    assert all(isinstance(row, tuple) and len(row) == 3 for row in rows)
+
+
+def test_tuple_rows():
+    for kwargs in (
+        {},
+        {'shard': 1, 'num_shards': 3},
+        {'shard': 2, 'num_shards': 3, 'strided': True},
+        {'strategy': 'pairwise'},
+    ):
+        assert to_dicts(User().positive(row_format='tuple', **kwargs)) == list(User().positive(**kwargs))
+        assert to_dicts(User().negative(row_format='tuple', **kwargs)) == list(User().negative(**kwargs))
+
+
+def test_shared_missing():
+    rows = list(User().positive(row_format='tuple'))[1:]
+
+    missing = [value for row in rows for value in row if type(value).__name__ == 'Missing']
+
+    assert missing
+    assert all(value is MISSING for value in missing)
+
+
+def test_unknown_row_format():
+    with pytest.raises(ValueError):
+        next(User().positive(row_format='list'))
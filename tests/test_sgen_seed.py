@@ -0,0 +1,123 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from fields import Integer, String, Float, Collection, Nested, DateTime
+from validate import Length
+from sgen import SGen
+from cache import set_cache_size, clear_cache, _cache
+
+
+class Pet(SGen):
+    name = String()
+    age = Integer()
+
+
+class User(SGen):
+    login = String(validate=Length(min=3, max=6))
+    score = Float()
+    tags = Collection(Integer())
+    created = DateTime()
+    pet = Nested(Pet())
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_same_seed_same_datasets():
+    assert list(User(seed=1).positive()) == list(User(seed=1).positive())
+    assert list(User(seed=1).negative()) == list(User(seed=1).negative())
+    assert list(User(seed='a').positive(strategy='pairwise')) == list(User(seed='a').positive(strategy='pairwise'))
+
+
+def test_different_seeds():
+    assert list(User(seed=1).positive()) != list(User(seed=2).positive())
+
+
+def test_without_seed_values_differ():
+    assert User().seed is None
+    assert any(list(Pet().positive()) != list(Pet().positive()) for _ in range(5))
+
+
+def columns(schema):
+    return {name: list(values) for name, values in schema._columns(True, 'product', 2, False)}
+
+
+def test_fields_have_independent_streams():
+    class Reordered(SGen):
+        pet = Nested(Pet())
+        extra = String()
+        created = DateTime()
+        login = String(validate=Length(min=3, max=6))
+        score = Float()
+        tags = Collection(Integer())
+
+    expected = columns(User(seed=3))
+    values = columns(Reordered(seed=3))
+    del values['extra']
+
+    assert values == expected
+
+
+def test_nested_schema_uses_the_outer_seed():
+    pets = columns(User(seed=4))['pet']
+
+    assert pets == columns(User(seed=4))['pet']
+    assert pets != list(Pet(seed=4).positive())
+
+
+def test_shards_match_the_full_run():
+    full = list(User(seed=5).positive())
+    shards = [list(User(seed=5).positive(shard=shard, num_shards=3)) for shard in range(3)]
+
+    assert sum(shards, []) == full
+
+
+def test_cache_keeps_seeded_values():
+    set_cache_size(64)
+    clear_cache()
+    try:
+        unseeded = list(Pet().positive())
+        seeded = list(Pet(seed=6).positive())
+
+        assert list(Pet(seed=6).positive()) == seeded
+        assert list(Pet(seed=7).positive()) != seeded
+        assert list(Pet().positive()) == unseeded
+    finally:
+        set_cache_size(0)
+        clear_cache()
+
+
+def test_same_datasets_in_another_process():
+    code = 'from tests.test_sgen_seed import User; print(repr(list(User(seed=8).negative())))'
+    outputs = {
+        subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True,
+            env={'PYTHONPATH': str(ROOT), 'PYTHONHASHSEED': str(hash_seed)},
+        ).stdout
+        for hash_seed in (1, 2)
+    }
+
+    assert outputs == {repr(list(User(seed=8).negative())) + '\n'}
+
+
+def test_parallel_matches_the_serial_run():
+    assert list(User(seed=9).generate_parallel(workers=2, chunk_size=100)) == list(User(seed=9).positive())
+
+
+def test_invalidate_after_seeded_run():
+    set_cache_size(64)
+    clear_cache()
+    try:
+        list(Pet(seed=10).positive())
+        list(Pet(seed=11).positive())
+        list(Pet().positive())
+        assert len(_cache) == 6
+
+        Pet.name.invalidate()
+
+        assert len(_cache) == 3
+        assert all(key[0][0] is Integer for key in _cache._entries)
+    finally:
+        set_cache_size(0)
+        clear_cache()
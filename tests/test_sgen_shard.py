@@ -0,0 +1,53 @@
+import pytest
+
+from fields import Integer, String, Nested
+from sgen import SGen
+
+
+class Pet(SGen):
+    age = Integer(positive_data_from=lambda: [1, 2, 3], negative_data_from=lambda: ['one'])
+    name = String(positive_data_from=lambda: ['a', 'b'], negative_data_from=lambda: [0, 1])
+
+
+class User(SGen):
+    login = String(positive_data_from=lambda: ['x', 'y', 'z'], negative_data_from=lambda: [None])
+    pet = Nested(Pet())
+    score = Integer(positive_data_from=lambda: [10, 20], negative_data_from=lambda: ['ten', 'twenty'])
+
+
+def test_contiguous_shards():
+    for method in (User().positive, User().negative):
+        datasets = list(method())
+
+        for num_shards in (1, 2, 3, 7, len(datasets) + 5):
+            shards = [list(method(shard=shard, num_shards=num_shards)) for shard in range(num_shards)]
+
+            assert sum(shards, []) == datasets
+            assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+
+def test_strided_shards():
+    for method in (User().positive, User().negative):
+        datasets = list(method())
+
+        for num_shards in (2, 5):
+            for shard in range(num_shards):
+                assert list(method(shard=shard, num_shards=num_shards, strided=True)) == datasets[shard::num_shards]
+
+
+def test_pairwise_shards():
+    datasets = list(User().negative(strategy='pairwise'))
+    shards = [list(User().negative(strategy='pairwise', shard=shard, num_shards=4)) for shard in range(4)]
+
+    assert sum(shards, []) == datasets
+
+
+def test_invalid_shards():
+    with pytest.raises(ValueError):
+        next(User().positive(shard=3, num_shards=3))
+
+    with pytest.raises(ValueError):
+        next(User().positive(shard=0))
+
+    with pytest.raises(ValueError):
+        next(User().positive(shard=0, num_shards=0))
@@ -0,0 +1,131 @@
+import pytest
+
+from fields import Integer, String, Collection, Nested
+from validate import OneOf, Range
+from sgen import SGen
+
+
+class Pet(SGen):
+    age = Integer(validate=OneOf(choices=[1, 2, 3]))
+    tags = Collection(data_type=Integer(validate=OneOf(choices=[5, 6]), allow_none=False, required=True))
+
+
+class User(SGen):
+    name = String(positive_data_from=lambda: ['a', 'b'], negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(validate=Range(min=1, max=9))
+
+
+def test_positive_len():
+    space = User().positive_space()
+
+    assert len(space) == len(list(space)) == 2 * (5 * 4) * 4
+
+
+def test_positive_random_access():
+    space = User().positive_space()
+    datasets = list(space)
+
+    for index in range(len(datasets)):
+        assert space[index] == datasets[index]
+
+    assert space[-1] == datasets[-1]
+    assert User().dataset_at(0) == datasets[0]
+
+    with pytest.raises(IndexError):
+        space[len(datasets)]
+
+
+def test_negative_random_access():
+    space = User().negative_space()
+    datasets = list(space)
+
+    assert len(space) == len(datasets)
+    for index in range(len(datasets)):
+        assert space[index] == datasets[index]
+
+
+def test_slicing():
+    space = User().negative_space()
+    datasets = list(space)
+
+    assert list(space[10:50]) == datasets[10:50]
+    assert list(space[3::7]) == datasets[3::7]
+    assert list(space[::-3]) == datasets[::-3]
+    assert space[10:50][5] == datasets[15]
+    assert len(space[10:50]) == 40
+
+
+def test_huge_space():
+    schema = type('Wide', (SGen,), {
+        f'field_{index:03}': Integer(validate=OneOf(choices=[1, 2, 3, 4]), allow_none=False, required=True)
+        for index in range(100)
+    })()
+
+    space = schema.positive_space()
+
+    assert space.size == 4 ** 100
+    assert space[0] == {f'field_{index:03}': 1 for index in range(100)}
+    assert space[space.size - 1] == {f'field_{index:03}': 4 for index in range(100)}
+    assert space[4 ** 99] == {f'field_{index:03}': 2 if index == 0 else 1 for index in range(100)}
+
+
+def test_count():
+    schema = User()
+
+    assert schema.count() == len(list(schema.positive()))
+    assert schema.count(is_positive=False) == len(list(schema.negative()))
+
+
+def test_estimate():
+    estimate = User().estimate()
+    negative_space = User().negative_space()
+
+    assert estimate.positive == 2 * (5 * 4) * 4
+    assert estimate.negative == len(negative_space)
+    assert list(estimate.negative_fields) == ['name', 'pet', 'score']
+    assert estimate.negative_fields['name'] == 1 * (5 * 4) * 4
+    assert estimate.all_negative == negative_space.products[-1].size
+    assert sum(estimate.negative_fields.values()) + estimate.all_negative == estimate.negative
+
+
+def test_max_datasets():
+    class Limited(User):
+        max_datasets = 100
+
+    with pytest.raises(ValueError):
+        next(Limited().positive())
+
+    with pytest.raises(ValueError):
+        next(Limited().negative())
+
+    assert len(list(Limited().positive(strategy='pairwise'))) <= 100
+
+
+def test_sample():
+    space = User().negative_space()
+    datasets = list(space)
+
+    sample = space.sample(50, seed=1)
+
+    assert len(sample) == 50
+    assert all(dataset in datasets for dataset in sample)
+    assert len({repr(dataset) for dataset in sample}) == 50
+    assert space.sample(50, seed=1) == sample
+    assert len(space.sample(len(datasets))) == len(datasets)
+    assert len(User().sample(10, is_positive=False)) == 10
+
+    with pytest.raises(ValueError):
+        space.sample(len(datasets) + 1)
+
+
+def test_sample_huge_space():
+    schema = type('Wide', (SGen,), {
+        f'field_{index:03}': Integer(validate=OneOf(choices=[1, 2, 3, 4]), allow_none=False, required=True)
+        for index in range(100)
+    })()
+
+    sample = schema.sample(500, seed=0)
+
+    assert len(sample) == 500
+    assert len({tuple(dataset.values()) for dataset in sample}) == 500
@@ -0,0 +1,72 @@
+import copy
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fields import Integer, String, Collection, Nested
+from validate import Length, OneOf, Range
+from sgen import SGen
+
+
+class Pet(SGen):
+    age = Integer(validate=Range(min=1, max=5), negative_data_from=lambda: ['one'])
+    name = String(validate=OneOf(choices=['a', 'b', 'c']), negative_data_from=lambda: [1, 2])
+
+
+class User(SGen):
+    login = String(validate=OneOf(choices=['x', 'y']), negative_data_from=lambda: [0])
+    pet = Nested(Pet())
+    score = Integer(validate=OneOf(choices=[10, 20, 30]), negative_data_from=lambda: ['ten'])
+    tags = Collection(
+        Integer(validate=OneOf(choices=[1, 2])), validate=Length(min=1, max=2), negative_data_from=lambda: [[0], 'tag']
+    )
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def canonical(datasets):
+    return [repr(sorted(dataset.items())) for dataset in datasets]
+
+
+def test_shared_schema_from_many_threads():
+    user = User()
+    expected = {True: canonical(user.positive()), False: canonical(user.negative())}
+
+    def generate(number):
+        is_positive = number % 2 == 0
+        return is_positive, canonical(user.positive() if is_positive else user.negative())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(generate, range(32)))
+
+    assert all(datasets == expected[is_positive] for is_positive, datasets in results)
+
+
+def test_shared_field_from_many_threads():
+    field = Collection(Integer(validate=OneOf(choices=[1, 2, 3])), validate=Length(min=2, max=3))
+    expected = list(field.positive())
+
+    def generate(_):
+        values = list(field.positive())
+        field.negative()
+        return values
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(values == expected for values in executor.map(generate, range(200)))
+
+
+def test_fields_can_be_copied():
+    field = Integer(validate=OneOf(choices=[1]))
+    field.positive()
+
+    for clone in (copy.deepcopy(field), pickle.loads(pickle.dumps(field))):
+        assert list(clone.values) == []
+        assert list(clone.positive()) == list(field.positive())
@@ -0,0 +1,103 @@
+import pickle
+from time import perf_counter
+
+from fields import Integer, Collection, String
+from validate import OneOf
+from utils import ValuesStorage, Missing
+
+
+def test_type_aware_membership():
+    storage = ValuesStorage([1])
+
+    assert 1 in storage
+    assert True not in storage
+    assert 1.0 not in storage
+
+    storage.append(True)
+
+    assert True in storage
+    assert storage == [1, True]
+
+
+def test_unhashable_values():
+    storage = ValuesStorage([[1, 2], {'a': [1]}, {3}])
+
+    assert [1, 2] in storage
+    assert [True, 2] in storage
+    assert (1, 2) not in storage
+    assert [[1, 2]] not in storage
+    assert {'a': [1]} in storage
+    assert {'a': [2]} not in storage
+    assert {3} in storage
+    assert frozenset({3}) not in storage
+
+
+def test_unkeyed_values():
+    class Unhashable:
+        __hash__ = None
+
+        def __init__(self, value):
+            self.value = value
+
+        def __eq__(self, other):
+            return isinstance(other, Unhashable) and self.value == other.value
+
+    storage = ValuesStorage([Unhashable(1)])
+
+    assert Unhashable(1) in storage
+    assert Unhashable(2) not in storage
+
+
+def test_mutations():
+    storage = ValuesStorage([1, 2, 2])
+
+    storage.remove(2)
+    assert 2 in storage
+
+    storage.remove(2)
+    assert 2 not in storage
+
+    storage[0] = 'a'
+    assert 1 not in storage
+    assert 'a' in storage
+
+    storage.insert(0, None)
+    assert None in storage
+
+    storage.clear()
+    assert 'a' not in storage
+
+
+def test_pickle():
+    storage = pickle.loads(pickle.dumps(ValuesStorage([1, [2]])))
+
+    assert storage == [1, [2]]
+    assert [2] in storage
+    assert 1.0 not in storage
+
+
+def test_field_register():
+    field = Integer(validate=OneOf(choices=[1, True, 1.0, 1]))
+
+    values = field.positive()
+
+    assert [type(value) for value in values] == [int, bool, float, type(None), Missing]
+
+
+def test_large_positive_data_from():
+    values = list(range(100000)) * 2
+
+    started = perf_counter()
+    positive_values = String(positive_data_from=lambda: values).positive()
+
+    assert len(positive_values) == 100000
+    assert perf_counter() - started < 5
+
+
+def test_collection_values():
+    field = Collection(data_type=Integer(validate=OneOf(choices=[1, 2]), allow_none=False, required=True))
+
+    values = field.positive()
+
+    assert None in values
+    assert any(isinstance(value, list) for value in values)
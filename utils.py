@@ -1,23 +1,198 @@
 from inspect import isgeneratorfunction, isgenerator
+from typing import Any, Callable, Sequence
 
 
 class Missing:
-    """Represents an instance of a missing field"""
+    """Represents an instance of a missing field, there is a single instance per process"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __reduce__(self):
+        return Missing, ()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         return "<sgen.missing>"
 
 
+# The instance of Missing, compare values with it by identity
+MISSING = Missing()
+
+
+def may_be_missing(values: Sequence) -> bool:
+    """
+    Returns True if the values of a field contain MISSING.
+
+    :param values: Field values.
+    :return: True if the field can be missing from a dataset.
+    """
+
+    return isinstance(values, tuple) and any(value is MISSING for value in values)
+
+
+def thread_local_property(name: str, factory: Callable[[], Any]) -> property:
+    """
+    Creates an attribute whose value is separate for every thread.
+
+    The values are kept in the threading.local object stored in the _local attribute of the instance.
+
+    :param name: Attribute name.
+    :param factory: Function that returns the initial value in a new thread.
+    :return: Property.
+    """
+
+    def getter(self):
+        try:
+            return getattr(self._local, name)
+        except AttributeError:
+            value = factory()
+            setattr(self._local, name, value)
+            return value
+
+    def setter(self, value):
+        setattr(self._local, name, value)
+
+    return property(getter, setter)
+
+
+# Marks canonical keys of unhashable containers, so they never match a user tuple
+_LIST = object()
+_DICT = object()
+
+
+def _element_key(value):
+    """
+    Returns a hashable key that is equal for values equal by ==, or raises TypeError.
+
+    :param value: Element of a container.
+    :return: Hashable key.
+    """
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    if isinstance(value, list):
+        return _LIST, tuple(_element_key(item) for item in value)
+    if isinstance(value, dict):
+        return _DICT, frozenset((key, _element_key(item)) for key, item in value.items())
+
+    raise TypeError(f"Unhashable value: {type(value).__name__}")
+
+
+def values_key(value):
+    """
+    Returns a hashable key that is equal for values of the same type equal by ==.
+
+    :param value: Field value.
+    :return: Hashable key or None if the value cannot be keyed.
+    """
+
+    if type(value) is float and value != value:
+        return None  # NaN is not equal to itself
+
+    try:
+        return type(value), _element_key(value)
+    except TypeError:
+        return None
+
+
 class ValuesStorage(list):
-    """Represents storage for field values"""
+    """
+    Represents storage for field values
+
+    Values keep the insertion order, membership is checked through a dictionary of
+    canonical keys: values are equal if they are of the same type and equal by ==,
+    so 1, True and 1.0 are distinct values.
+    """
+
+    def __init__(self, values=()):
+        super().__init__()
+        self._counts = {}
+        self._unkeyed = []
+        self.extend(values)
+
+    def _index(self, value):
+        key = values_key(value)
+        if key is None:
+            self._unkeyed.append(value)
+        else:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def _reindex(self):
+        self._counts = {}
+        self._unkeyed = []
+        for value in self:
+            self._index(value)
 
     def __contains__(self, item):
-        present = list(filter(
-            lambda value: type(value) == type(item) and value == item,
-            self
-        ))
+        key = values_key(item)
+        if key is not None and key in self._counts:
+            return True
+
+        return any(type(value) == type(item) and value == item for value in self._unkeyed)
+
+    def append(self, value):
+        super().append(value)
+        self._index(value)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._reindex()
+        return self
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self._index(value)
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def remove(self, value):
+        super().remove(value)
+        self._reindex()
+
+    def pop(self, index=-1):
+        value = super().pop(index)
+        self._reindex()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._reindex()
 
-        return bool(present)
+    def __reduce__(self):
+        return type(self), (list(self),)
 
 
 def is_generator(obj) -> bool: